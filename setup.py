@@ -18,6 +18,9 @@ if sys.platform == 'linux':
     requirements_extra = requirements_extra.splitlines()
     requirements += requirements_extra
 
+with open('requirements_speedups.txt') as f:
+    requirements_speedups = f.read().splitlines()
+
 with open('README.md') as f:
     readme = f.read()
 readme = "\n".join(readme.split('\n')[2:])
@@ -37,6 +40,7 @@ setup(
     long_description=readme,
     long_description_content_type='text/markdown',
     install_requires=requirements,
+    extras_require={'speedups': requirements_speedups},
     setup_requires=['wheel'],
     description_file="README.md",
     entry_points={
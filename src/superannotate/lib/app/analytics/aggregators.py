@@ -1,5 +1,4 @@
 import copy
-import json
 import logging
 from dataclasses import dataclass
 from pathlib import Path
@@ -9,6 +8,7 @@ from typing import Union
 
 import lib.core as constances
 import pandas as pd
+from lib.app.analytics.common import load_json
 from lib.app.exceptions import AppException
 from lib.core import ATTACHED_VIDEO_ANNOTATION_POSTFIX
 from lib.core import PIXEL_ANNOTATION_POSTFIX
@@ -129,7 +129,7 @@ class DataAggregator:
         raws = []
         for annotation_path in annotation_paths:
             annotation_path = Path(annotation_path)
-            annotation_data = json.load(open(annotation_path))
+            annotation_data = load_json(annotation_path)
             raw_data = VideoRawData()
             # metadata
             raw_data.videoName = annotation_data["metadata"]["name"]
@@ -242,7 +242,7 @@ class DataAggregator:
             "tag": [],
         }
 
-        classes_json = json.load(open(self.classes_path))
+        classes_json = load_json(self.classes_path)
         class_name_to_color = {}
         class_group_name_to_values = {}
         for annotation_class in classes_json:
@@ -267,7 +267,7 @@ class DataAggregator:
                     annotation_data[annotation_key].append(None)
 
         for annotation_path in annotations_paths:
-            annotation_json = json.load(open(annotation_path))
+            annotation_json = load_json(annotation_path)
             parts = annotation_path.name.split(self.annotation_suffix)
             if len(parts) != 2:
                 continue
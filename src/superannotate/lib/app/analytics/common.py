@@ -1,15 +1,140 @@
+import concurrent.futures
 import json
 import logging
+import os
+from functools import partial
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from lib.app.exceptions import AppException
 from lib.core import DEPRICATED_DOCUMENT_VIDEO_MESSAGE
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 logger = logging.getLogger("root")
 
+# Exports with at least this many annotation files are parsed in a process pool
+# with the default start method. Off by default, spawn and forkserver re-import
+# the caller's __main__ (scripts need an if __name__ == "__main__" guard) and
+# forking a process that runs threads can deadlock.
+PARALLEL_AGGREGATION_FILES_COUNT = None
+
+META_COORDINATE_COLUMNS = {
+    "bbox": ("meta_x1", "meta_y1", "meta_x2", "meta_y2"),
+    "point": ("meta_x", "meta_y"),
+}
+
+AGGREGATION_COLUMNS = (
+    "imageName",
+    "imageHeight",
+    "imageWidth",
+    "imageStatus",
+    "imagePinned",
+    "instanceId",
+    "className",
+    "attributeGroupName",
+    "attributeName",
+    "type",
+    "error",
+    "locked",
+    "visible",
+    "trackingId",
+    "probability",
+    "pointLabels",
+    "meta",
+    "classColor",
+    "groupId",
+    "createdAt",
+    "creatorRole",
+    "creationType",
+    "creatorEmail",
+    "updatedAt",
+    "updatorRole",
+    "updatorEmail",
+    "folderName",
+    "imageAnnotator",
+    "imageQA",
+)
+
+
+def load_json(path: Path):
+    """Loads a JSON file, with orjson when it is installed."""
+    data = path.read_bytes()
+    try:
+        return json_loads(data)
+    except ValueError:
+        # orjson rejects NaN and integers over 64 bits, which json accepts
+        return json.loads(data)
+
+
+def _write_image_annotation(output_dir, image, image_df):
+    project_suffix = "objects.json"
+    image_status = None
+    image_pinned = None
+    image_height = None
+    image_width = None
+    image_annotation = {"instances": [], "metadata": {}, "tags": [], "comments": []}
+    for _, instance_df in image_df.groupby("instanceId", sort=False):
+        first_row = next(instance_df.itertuples(index=False))
+        annotation_type = first_row.type
+        annotation_meta = first_row.meta
+
+        instance_annotation = {
+            "className": first_row.className,
+            "type": annotation_type,
+            "attributes": [],
+            "probability": first_row.probability,
+            "error": first_row.error,
+        }
+        point_labels = first_row.pointLabels
+        if point_labels is None:
+            point_labels = []
+        instance_annotation["pointLabels"] = point_labels
+        instance_annotation["locked"] = bool(first_row.locked)
+        instance_annotation["visible"] = bool(first_row.visible)
+        instance_annotation["trackingId"] = first_row.trackingId
+        instance_annotation["groupId"] = int(first_row.groupId)
+        instance_annotation.update(annotation_meta)
+        for row in instance_df.itertuples(index=False):
+            if pd.notna(row.attributeGroupName):
+                instance_annotation["attributes"].append(
+                    {"groupName": row.attributeGroupName, "name": row.attributeName}
+                )
+        image_annotation["instances"].append(instance_annotation)
+        image_width = image_width or first_row.imageWidth
+        image_height = image_height or first_row.imageHeight
+        image_pinned = image_pinned or first_row.imagePinned
+        image_status = image_status or first_row.imageStatus
+
+    comments = image_df[image_df["type"] == "comment"]
+    for comment in comments.itertuples(index=False):
+        comment_json = {}
+        comment_json.update(comment.meta)
+        comment_json["correspondence"] = comment_json["comments"]
+        del comment_json["comments"]
+        comment_json["resolved"] = comment.commentResolved
+        image_annotation["comments"].append(comment_json)
+
+    tags = image_df[image_df["type"] == "tag"]
+    for tag in tags.itertuples(index=False):
+        image_annotation["tags"].append(tag.tag)
+
+    image_annotation["metadata"] = {
+        "width": int(image_width),
+        "height": int(image_height),
+        "status": image_status,
+        "pinned": bool(image_pinned),
+    }
+    # json.dumps encodes to one string, json.dump writes every chunk separately
+    with open(output_dir / f"{image}___{project_suffix}", "w") as annotation_file:
+        annotation_file.write(json.dumps(image_annotation, indent=4))
+
 
 def df_to_annotations(df, output_dir):
     """Converts and saves pandas DataFrame annotation info (see aggregate_annotations_as_df)
@@ -27,113 +152,262 @@ def df_to_annotations(df, output_dir):
 
     """
 
-    project_suffix = "objects.json"
-    images = df["imageName"].dropna().unique()
-    for image in images:
-        image_status = None
-        image_pinned = None
-        image_height = None
-        image_width = None
-        image_df = df[df["imageName"] == image]
-        image_annotation = {"instances": [], "metadata": {}, "tags": [], "comments": []}
-        instances = image_df["instanceId"].dropna().unique()
-        for instance in instances:
-            instance_df = image_df[image_df["instanceId"] == instance]
-            # print(instance_df["instanceId"])
-            annotation_type = instance_df.iloc[0]["type"]
-            annotation_meta = instance_df.iloc[0]["meta"]
-
-            instance_annotation = {
-                "className": instance_df.iloc[0]["className"],
-                "type": annotation_type,
-                "attributes": [],
-                "probability": instance_df.iloc[0]["probability"],
-                "error": instance_df.iloc[0]["error"],
-            }
-            point_labels = instance_df.iloc[0]["pointLabels"]
-            if point_labels is None:
-                point_labels = []
-            instance_annotation["pointLabels"] = point_labels
-            instance_annotation["locked"] = bool(instance_df.iloc[0]["locked"])
-            instance_annotation["visible"] = bool(instance_df.iloc[0]["visible"])
-            instance_annotation["trackingId"] = instance_df.iloc[0]["trackingId"]
-            instance_annotation["groupId"] = int(instance_df.iloc[0]["groupId"])
-            instance_annotation.update(annotation_meta)
-            for _, row in instance_df.iterrows():
-                if row["attributeGroupName"] is not None:
-                    instance_annotation["attributes"].append(
-                        {
-                            "groupName": row["attributeGroupName"],
-                            "name": row["attributeName"],
-                        }
-                    )
-            image_annotation["instances"].append(instance_annotation)
-            image_width = image_width or instance_df.iloc[0]["imageWidth"]
-            image_height = image_height or instance_df.iloc[0]["imageHeight"]
-            image_pinned = image_pinned or instance_df.iloc[0]["imagePinned"]
-            image_status = image_status or instance_df.iloc[0]["imageStatus"]
-
-        comments = image_df[image_df["type"] == "comment"]
-        for _, comment in comments.iterrows():
-            comment_json = {}
-            comment_json.update(comment["meta"])
-            comment_json["correspondence"] = comment_json["comments"]
-            del comment_json["comments"]
-            comment_json["resolved"] = comment["commentResolved"]
-            image_annotation["comments"].append(comment_json)
-
-        tags = image_df[image_df["type"] == "tag"]
-        for _, tag in tags.iterrows():
-            image_annotation["tags"].append(tag["tag"])
-
-        image_annotation["metadata"] = {
-            "width": int(image_width),
-            "height": int(image_height),
-            "status": image_status,
-            "pinned": bool(image_pinned),
+    # groupby indexes the rows once instead of a full column scan per image
+    for image, image_df in df.groupby("imageName", sort=False):
+        _write_image_annotation(output_dir, image, image_df)
+
+    # classes and their attributes are built from the deduplicated rows in the
+    # order of their first appearance
+    annotation_classes = {}
+    classes_df = df[["className", "classColor"]].dropna(subset=["className"])
+    for row in classes_df.drop_duplicates(subset=["className"]).itertuples(index=False):
+        annotation_classes[row.className] = {
+            "name": row.className,
+            "color": row.classColor,
+            "attribute_groups": [],
         }
-        json.dump(
-            image_annotation,
-            open(output_dir / f"{image}___{project_suffix}", "w"),
-            indent=4,
+    attribute_groups = {}
+    attributes_df = df[["className", "attributeGroupName", "attributeName"]].dropna()
+    for row in attributes_df.drop_duplicates().itertuples(index=False):
+        attribute_group = attribute_groups.get((row.className, row.attributeGroupName))
+        if attribute_group is None:
+            attribute_group = {"name": row.attributeGroupName, "attributes": []}
+            attribute_groups[(row.className, row.attributeGroupName)] = attribute_group
+            annotation_classes[row.className]["attribute_groups"].append(
+                attribute_group
+            )
+        attribute_group["attributes"].append({"name": row.attributeName})
+
+    Path(output_dir / "classes").mkdir(exist_ok=True)
+    with open(output_dir / "classes" / "classes.json", "w") as classes_file:
+        classes_file.write(json.dumps(list(annotation_classes.values()), indent=4))
+
+
+def _to_datetime(values: pd.Series) -> pd.Series:
+    try:
+        return pd.to_datetime(values)
+    except (TypeError, ValueError):
+        # the values don't share the format inferred from the first one
+        return pd.Series(
+            [pd.to_datetime(value) for value in values],
+            index=values.index,
+            name=values.name,
         )
 
-    annotation_classes = []
-    for _, row in df.iterrows():
-        if row["className"] is None:
-            continue
-        for annotation_class in annotation_classes:
-            if annotation_class["name"] == row["className"]:
-                break
-        else:
-            annotation_classes.append(
-                {
-                    "name": row["className"],
-                    "color": row["classColor"],
-                    "attribute_groups": [],
-                }
+
+def _get_image_metadata(image_name, annotations):
+    image_metadata = {"imageName": image_name}
+
+    image_metadata["imageHeight"] = annotations["metadata"].get("height")
+    image_metadata["imageWidth"] = annotations["metadata"].get("width")
+    image_metadata["imageStatus"] = annotations["metadata"].get("status")
+    image_metadata["imagePinned"] = annotations["metadata"].get("pinned")
+    image_metadata["imageAnnotator"] = annotations["metadata"].get("annotatorEmail")
+    image_metadata["imageQA"] = annotations["metadata"].get("qaEmail")
+    return image_metadata
+
+
+def _get_user_metadata(annotation):
+    annotation_created_at = annotation.get("createdAt")
+    annotation_created_by = annotation.get("createdBy")
+    annotation_creator_email = None
+    annotation_creator_role = None
+    if annotation_created_by:
+        annotation_creator_email = annotation_created_by.get("email")
+        annotation_creator_role = annotation_created_by.get("role")
+    annotation_creation_type = annotation.get("creationType")
+    annotation_updated_at = annotation.get("updatedAt")
+    annotation_updated_by = annotation.get("updatedBy")
+    annotation_updator_email = None
+    annotation_updator_role = None
+    if annotation_updated_by:
+        annotation_updator_email = annotation_updated_by.get("email")
+        annotation_updator_role = annotation_updated_by.get("role")
+    user_metadata = {
+        "createdAt": annotation_created_at,
+        "creatorRole": annotation_creator_role,
+        "creatorEmail": annotation_creator_email,
+        "creationType": annotation_creation_type,
+        "updatedAt": annotation_updated_at,
+        "updatorRole": annotation_updator_role,
+        "updatorEmail": annotation_updator_email,
+    }
+    return user_metadata
+
+
+def _get_annotation_file_rows(
+    project_root,
+    type_postfix: str,
+    class_name_to_color: dict,
+    class_group_name_to_values: dict,
+    valid_attributes: set,
+    include_comments: bool,
+    include_tags: bool,
+    annotation_path: Path,
+) -> list:
+    """Returns aggregate_image_annotations_as_df rows of a single annotation file."""
+    rows = []
+    annotation_json = load_json(annotation_path)
+    parts = annotation_path.name.split(type_postfix)
+    if len(parts) != 2:
+        return rows
+    image_name = parts[0]
+    image_metadata = _get_image_metadata(image_name, annotation_json)
+    annotation_instance_id = 0
+    if include_comments:
+        for annotation in annotation_json["comments"]:
+            comment_resolved = annotation["resolved"]
+            comment_meta = {
+                "x": annotation["x"],
+                "y": annotation["y"],
+                "comments": annotation["correspondence"],
+            }
+            annotation_dict = {
+                "type": "comment",
+                "meta": comment_meta,
+                "commentResolved": comment_resolved,
+            }
+            user_metadata = _get_user_metadata(annotation)
+            annotation_dict.update(user_metadata)
+            annotation_dict.update(image_metadata)
+            rows.append(annotation_dict)
+    if include_tags:
+        for annotation in annotation_json["tags"]:
+            annotation_dict = {"type": "tag", "tag": annotation}
+            annotation_dict.update(image_metadata)
+            rows.append(annotation_dict)
+    for annotation in annotation_json["instances"]:
+        annotation_type = annotation.get("type", "mask")
+        annotation_class_name = annotation.get("className")
+        if (
+            annotation_class_name is None
+            or annotation_class_name not in class_name_to_color
+        ):
+            logger.warning(
+                "Annotation class %s not found in classes json. Skipping.",
+                annotation_class_name,
             )
-            annotation_class = annotation_classes[-1]
-        if row["attributeGroupName"] is None or row["attributeName"] is None:
             continue
-        for attribute_group in annotation_class["attribute_groups"]:
-            if attribute_group["name"] == row["attributeGroupName"]:
-                break
-        else:
-            annotation_class["attribute_groups"].append(
-                {"name": row["attributeGroupName"], "attributes": []}
-            )
-            attribute_group = annotation_class["attribute_groups"][-1]
-        for attribute in attribute_group["attributes"]:
-            if attribute["name"] == row["attributeName"]:
-                break
+        annotation_class_color = class_name_to_color[annotation_class_name]
+        annotation_group_id = annotation.get("groupId")
+        annotation_locked = annotation.get("locked")
+        annotation_visible = annotation.get("visible")
+        annotation_tracking_id = annotation.get("trackingId")
+        annotation_meta = None
+        if annotation_type in ["bbox", "polygon", "polyline", "cuboid"]:
+            annotation_meta = {"points": annotation["points"]}
+        elif annotation_type == "point":
+            annotation_meta = {"x": annotation["x"], "y": annotation["y"]}
+        elif annotation_type == "ellipse":
+            annotation_meta = {
+                "cx": annotation["cx"],
+                "cy": annotation["cy"],
+                "rx": annotation["rx"],
+                "ry": annotation["ry"],
+                "angle": annotation["angle"],
+            }
+        elif annotation_type == "mask":
+            annotation_meta = {"parts": annotation["parts"]}
+        elif annotation_type == "template":
+            annotation_meta = {
+                "connections": annotation["connections"],
+                "points": annotation["points"],
+            }
+        annotation_error = annotation.get("error")
+        annotation_probability = annotation.get("probability")
+        annotation_point_labels = annotation.get("pointLabels")
+        attributes = annotation.get("attributes")
+        user_metadata = _get_user_metadata(annotation)
+        folder_name = None
+        if annotation_path.parent != Path(project_root):
+            folder_name = annotation_path.parent.name
+        num_added = 0
+        if not attributes:
+            annotation_dict = {
+                "imageName": image_name,
+                "instanceId": annotation_instance_id,
+                "className": annotation_class_name,
+                "type": annotation_type,
+                "locked": annotation_locked,
+                "visible": annotation_visible,
+                "trackingId": annotation_tracking_id,
+                "meta": annotation_meta,
+                "error": annotation_error,
+                "probability": annotation_probability,
+                "pointLabels": annotation_point_labels,
+                "classColor": annotation_class_color,
+                "groupId": annotation_group_id,
+                "folderName": folder_name,
+            }
+            annotation_dict.update(user_metadata)
+            annotation_dict.update(image_metadata)
+            rows.append(annotation_dict)
+            num_added = 1
         else:
-            attribute_group["attributes"].append({"name": row["attributeName"]})
+            for attribute in attributes:
+                attribute_group = attribute.get("groupName")
+                attribute_name = attribute.get("name")
+                if (
+                    annotation_class_name,
+                    attribute_group,
+                    attribute_name,
+                ) not in valid_attributes:
+                    if (
+                        attribute_group
+                        not in class_group_name_to_values[annotation_class_name]
+                    ):
+                        logger.warning(
+                            "Annotation class group %s not in classes json. Skipping.",
+                            attribute_group,
+                        )
+                    else:
+                        logger.warning(
+                            "Annotation class group value %s not in classes json. Skipping.",
+                            attribute_name,
+                        )
+                    continue
+                annotation_dict = {
+                    "imageName": image_name,
+                    "instanceId": annotation_instance_id,
+                    "className": annotation_class_name,
+                    "attributeGroupName": attribute_group,
+                    "attributeName": attribute_name,
+                    "type": annotation_type,
+                    "locked": annotation_locked,
+                    "visible": annotation_visible,
+                    "trackingId": annotation_tracking_id,
+                    "meta": annotation_meta,
+                    "error": annotation_error,
+                    "probability": annotation_probability,
+                    "pointLabels": annotation_point_labels,
+                    "classColor": annotation_class_color,
+                    "groupId": annotation_group_id,
+                    "folderName": folder_name,
+                }
+                annotation_dict.update(user_metadata)
+                annotation_dict.update(image_metadata)
+                rows.append(annotation_dict)
+                num_added += 1
 
-    Path(output_dir / "classes").mkdir(exist_ok=True)
-    json.dump(
-        annotation_classes, open(output_dir / "classes" / "classes.json", "w"), indent=4
-    )
+        if num_added > 0:
+            annotation_instance_id += 1
+    return rows
+
+
+def _get_annotations_rows(annotations_paths: list, *args) -> list:
+    """Returns the rows of every annotation file, files are parsed in a process
+    pool when PARALLEL_AGGREGATION_FILES_COUNT is set and reached and more than
+    one CPU is available.
+    """
+    get_rows = partial(_get_annotation_file_rows, *args)
+    if (
+        PARALLEL_AGGREGATION_FILES_COUNT is None
+        or len(annotations_paths) < PARALLEL_AGGREGATION_FILES_COUNT
+        or (os.cpu_count() or 1) < 2
+    ):
+        return list(map(get_rows, annotations_paths))
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        return list(executor.map(get_rows, annotations_paths, chunksize=32))
 
 
 def aggregate_image_annotations_as_df(
@@ -179,42 +453,14 @@ def aggregate_image_annotations_as_df(
 
     logger.info("Aggregating annotations from %s as pandas DataFrame", project_root)
 
-    annotation_data = {
-        "imageName": [],
-        "imageHeight": [],
-        "imageWidth": [],
-        "imageStatus": [],
-        "imagePinned": [],
-        "instanceId": [],
-        "className": [],
-        "attributeGroupName": [],
-        "attributeName": [],
-        "type": [],
-        "error": [],
-        "locked": [],
-        "visible": [],
-        "trackingId": [],
-        "probability": [],
-        "pointLabels": [],
-        "meta": [],
-        "classColor": [],
-        "groupId": [],
-        "createdAt": [],
-        "creatorRole": [],
-        "creationType": [],
-        "creatorEmail": [],
-        "updatedAt": [],
-        "updatorRole": [],
-        "updatorEmail": [],
-        "folderName": [],
-        "imageAnnotator": [],
-        "imageQA": [],
-    }
-
+    columns = list(AGGREGATION_COLUMNS)
     if include_comments:
-        annotation_data["commentResolved"] = []
+        columns.append("commentResolved")
     if include_tags:
-        annotation_data["tag"] = []
+        columns.append("tag")
+    # keys missing in an annotation are None, not NaN as from_records would fill
+    empty_record = dict.fromkeys(columns)
+    records = []
 
     classes_path = Path(project_root) / "classes" / "classes.json"
     if not classes_path.is_file():
@@ -223,9 +469,10 @@ def aggregate_image_annotations_as_df(
             + str(classes_path)
             + " not found. Please provide correct project export root"
         )
-    classes_json = json.load(open(classes_path))
+    classes_json = load_json(classes_path)
     class_name_to_color = {}
     class_group_name_to_values = {}
+    valid_attributes = set()
     for annotation_class in classes_json:
         name = annotation_class["name"]
         color = annotation_class["color"]
@@ -237,61 +484,24 @@ def aggregate_image_annotations_as_df(
                 class_group_name_to_values[name][attribute_group["name"]].append(
                     attribute["name"]
                 )
+                valid_attributes.add(
+                    (name, attribute_group["name"], attribute["name"])
+                )
 
     def __append_annotation(annotation_dict):
-        for annotation_key in annotation_data:
-            if annotation_key in annotation_dict:
-                annotation_data[annotation_key].append(annotation_dict[annotation_key])
-            else:
-                annotation_data[annotation_key].append(None)
-
-    def __get_image_metadata(image_name, annotations):
-        image_metadata = {"imageName": image_name}
-
-        image_metadata["imageHeight"] = annotations["metadata"].get("height")
-        image_metadata["imageWidth"] = annotations["metadata"].get("width")
-        image_metadata["imageStatus"] = annotations["metadata"].get("status")
-        image_metadata["imagePinned"] = annotations["metadata"].get("pinned")
-        image_metadata["imageAnnotator"] = annotations["metadata"].get("annotatorEmail")
-        image_metadata["imageQA"] = annotations["metadata"].get("qaEmail")
-        return image_metadata
-
-    def __get_user_metadata(annotation):
-        annotation_created_at = pd.to_datetime(annotation.get("createdAt"))
-        annotation_created_by = annotation.get("createdBy")
-        annotation_creator_email = None
-        annotation_creator_role = None
-        if annotation_created_by:
-            annotation_creator_email = annotation_created_by.get("email")
-            annotation_creator_role = annotation_created_by.get("role")
-        annotation_creation_type = annotation.get("creationType")
-        annotation_updated_at = pd.to_datetime(annotation.get("updatedAt"))
-        annotation_updated_by = annotation.get("updatedBy")
-        annotation_updator_email = None
-        annotation_updator_role = None
-        if annotation_updated_by:
-            annotation_updator_email = annotation_updated_by.get("email")
-            annotation_updator_role = annotation_updated_by.get("role")
-        user_metadata = {
-            "createdAt": annotation_created_at,
-            "creatorRole": annotation_creator_role,
-            "creatorEmail": annotation_creator_email,
-            "creationType": annotation_creation_type,
-            "updatedAt": annotation_updated_at,
-            "updatorRole": annotation_updator_role,
-            "updatorEmail": annotation_updator_email,
-        }
-        return user_metadata
+        records.append({**empty_record, **annotation_dict})
 
     annotations_paths = []
 
     if folder_names is None:
-        project_dir_content = Path(project_root).glob("*")
-        for entry in project_dir_content:
-            if entry.is_file() and entry.suffix == ".json":
-                annotations_paths.append(entry)
-            elif entry.is_dir() and entry.name != "classes":
-                annotations_paths.extend(list(entry.rglob("*.json")))
+        # scandir entries know their type without a stat call per entry
+        with os.scandir(project_root) as project_dir_content:
+            for entry in project_dir_content:
+                entry_path = Path(entry.path)
+                if entry.is_file() and entry_path.suffix == ".json":
+                    annotations_paths.append(entry_path)
+                elif entry.is_dir() and entry.name != "classes":
+                    annotations_paths.extend(list(entry_path.rglob("*.json")))
     else:
         for folder_name in folder_names:
             annotations_paths.extend(
@@ -300,166 +510,39 @@ def aggregate_image_annotations_as_df(
 
     if not annotations_paths:
         logger.warning(f"Could not find annotations in {project_root}.")
-    if len(list(Path(project_root).rglob("*___objects.json"))) > 0:
+    if any(path.name.endswith("___objects.json") for path in annotations_paths):
         type_postfix = "___objects.json"
     else:
         type_postfix = "___pixel.json"
-    for annotation_path in annotations_paths:
-        annotation_json = json.load(open(annotation_path))
-        parts = annotation_path.name.split(type_postfix)
-        if len(parts) != 2:
-            continue
-        image_name = parts[0]
-        image_metadata = __get_image_metadata(image_name, annotation_json)
-        annotation_instance_id = 0
-        if include_comments:
-            for annotation in annotation_json["comments"]:
-                comment_resolved = annotation["resolved"]
-                comment_meta = {
-                    "x": annotation["x"],
-                    "y": annotation["y"],
-                    "comments": annotation["correspondence"],
-                }
-                annotation_dict = {
-                    "type": "comment",
-                    "meta": comment_meta,
-                    "commentResolved": comment_resolved,
-                }
-                user_metadata = __get_user_metadata(annotation)
-                annotation_dict.update(user_metadata)
-                annotation_dict.update(image_metadata)
-                __append_annotation(annotation_dict)
-        if include_tags:
-            for annotation in annotation_json["tags"]:
-                annotation_dict = {"type": "tag", "tag": annotation}
-                annotation_dict.update(image_metadata)
-                __append_annotation(annotation_dict)
-        for annotation in annotation_json["instances"]:
-            annotation_type = annotation.get("type", "mask")
-            annotation_class_name = annotation.get("className")
-            if (
-                annotation_class_name is None
-                or annotation_class_name not in class_name_to_color
-            ):
-                logger.warning(
-                    "Annotation class %s not found in classes json. Skipping.",
-                    annotation_class_name,
-                )
-                continue
-            annotation_class_color = class_name_to_color[annotation_class_name]
-            annotation_group_id = annotation.get("groupId")
-            annotation_locked = annotation.get("locked")
-            annotation_visible = annotation.get("visible")
-            annotation_tracking_id = annotation.get("trackingId")
-            annotation_meta = None
-            if annotation_type in ["bbox", "polygon", "polyline", "cuboid"]:
-                annotation_meta = {"points": annotation["points"]}
-            elif annotation_type == "point":
-                annotation_meta = {"x": annotation["x"], "y": annotation["y"]}
-            elif annotation_type == "ellipse":
-                annotation_meta = {
-                    "cx": annotation["cx"],
-                    "cy": annotation["cy"],
-                    "rx": annotation["rx"],
-                    "ry": annotation["ry"],
-                    "angle": annotation["angle"],
-                }
-            elif annotation_type == "mask":
-                annotation_meta = {"parts": annotation["parts"]}
-            elif annotation_type == "template":
-                annotation_meta = {
-                    "connections": annotation["connections"],
-                    "points": annotation["points"],
-                }
-            annotation_error = annotation.get("error")
-            annotation_probability = annotation.get("probability")
-            annotation_point_labels = annotation.get("pointLabels")
-            attributes = annotation.get("attributes")
-            user_metadata = __get_user_metadata(annotation)
-            folder_name = None
-            if annotation_path.parent != Path(project_root):
-                folder_name = annotation_path.parent.name
-            num_added = 0
-            if not attributes:
-                annotation_dict = {
-                    "imageName": image_name,
-                    "instanceId": annotation_instance_id,
-                    "className": annotation_class_name,
-                    "type": annotation_type,
-                    "locked": annotation_locked,
-                    "visible": annotation_visible,
-                    "trackingId": annotation_tracking_id,
-                    "meta": annotation_meta,
-                    "error": annotation_error,
-                    "probability": annotation_probability,
-                    "pointLabels": annotation_point_labels,
-                    "classColor": annotation_class_color,
-                    "groupId": annotation_group_id,
-                    "folderName": folder_name,
-                }
-                annotation_dict.update(user_metadata)
-                annotation_dict.update(image_metadata)
-                __append_annotation(annotation_dict)
-                num_added = 1
-            else:
-                for attribute in attributes:
-                    attribute_group = attribute.get("groupName")
-                    attribute_name = attribute.get("name")
-                    if (
-                        attribute_group
-                        not in class_group_name_to_values[annotation_class_name]
-                    ):
-                        logger.warning(
-                            "Annotation class group %s not in classes json. Skipping.",
-                            attribute_group,
-                        )
-                        continue
-                    if (
-                        attribute_name
-                        not in class_group_name_to_values[annotation_class_name][
-                            attribute_group
-                        ]
-                    ):
-                        logger.warning(
-                            "Annotation class group value %s not in classes json. Skipping.",
-                            attribute_name,
-                        )
-                        continue
-                    annotation_dict = {
-                        "imageName": image_name,
-                        "instanceId": annotation_instance_id,
-                        "className": annotation_class_name,
-                        "attributeGroupName": attribute_group,
-                        "attributeName": attribute_name,
-                        "type": annotation_type,
-                        "locked": annotation_locked,
-                        "visible": annotation_visible,
-                        "trackingId": annotation_tracking_id,
-                        "meta": annotation_meta,
-                        "error": annotation_error,
-                        "probability": annotation_probability,
-                        "pointLabels": annotation_point_labels,
-                        "classColor": annotation_class_color,
-                        "groupId": annotation_group_id,
-                        "folderName": folder_name,
-                    }
-                    annotation_dict.update(user_metadata)
-                    annotation_dict.update(image_metadata)
-                    __append_annotation(annotation_dict)
-                    num_added += 1
-
-            if num_added > 0:
-                annotation_instance_id += 1
-
-    df = pd.DataFrame(annotation_data)
+    for rows in _get_annotations_rows(
+        annotations_paths,
+        project_root,
+        type_postfix,
+        class_name_to_color,
+        class_group_name_to_values,
+        valid_attributes,
+        include_comments,
+        include_tags,
+    ):
+        for annotation_dict in rows:
+            __append_annotation(annotation_dict)
 
     # Add classes/attributes w/o annotations
     if include_classes_wo_annotations:
+        annotated_classes = {record["className"] for record in records}
+        annotated_attributes = {
+            (
+                record["className"],
+                record["attributeGroupName"],
+                record["attributeName"],
+            )
+            for record in records
+        }
         for class_meta in classes_json:
             annotation_class_name = class_meta["name"]
             annotation_class_color = class_meta["color"]
 
-            if annotation_class_name not in df["className"].unique():
+            if annotation_class_name not in annotated_classes:
                 __append_annotation(
                     {
                         "className": annotation_class_name,
@@ -468,25 +551,15 @@ def aggregate_image_annotations_as_df(
                 )
                 continue
 
-            class_df = df[df["className"] == annotation_class_name][
-                ["className", "attributeGroupName", "attributeName"]
-            ]
-            attribute_groups = class_meta["attribute_groups"]
-
-            for attribute_group in attribute_groups:
-
+            for attribute_group in class_meta["attribute_groups"]:
                 attribute_group_name = attribute_group["name"]
-
-                attribute_group_df = class_df[
-                    class_df["attributeGroupName"] == attribute_group_name
-                ][["attributeGroupName", "attributeName"]]
-                attributes = attribute_group["attributes"]
-                for attribute in attributes:
+                for attribute in attribute_group["attributes"]:
                     attribute_name = attribute["name"]
-
-                    if not (
-                        attribute_name in attribute_group_df["attributeName"].unique()
-                    ):
+                    if (
+                        annotation_class_name,
+                        attribute_group_name,
+                        attribute_name,
+                    ) not in annotated_attributes:
                         __append_annotation(
                             {
                                 "className": annotation_class_name,
@@ -496,9 +569,12 @@ def aggregate_image_annotations_as_df(
                             }
                         )
 
-        df = pd.DataFrame(annotation_data)
+    df = pd.DataFrame.from_records(records, columns=columns)
 
     df = df.astype({"probability": float})
+    # the dates are parsed for the whole columns at once, not per annotation
+    for column in ("createdAt", "updatedAt"):
+        df[column] = _to_datetime(df[column])
 
     return df
 
@@ -524,6 +600,54 @@ def instance_consensus(inst_1, inst_2):
     return score
 
 
+def instances_consensus(inst, other_insts):
+    """Helper function that computes consensus scores between an instance and
+    each of the other instances in a single vectorized call, requires shapely 2:
+
+    :param inst: Instance for consensus scores.
+    :type inst: shapely object
+    :param other_insts: Instances for consensus scores, of the same type as inst.
+    :type other_insts: list of shapely objects
+
+    """
+    import shapely
+
+    if inst.geom_type == "Polygon":
+        intersect = shapely.intersection(inst, other_insts)
+        union = shapely.union(inst, other_insts)
+        scores = shapely.area(intersect) / shapely.area(union)
+    elif inst.geom_type == "Point":
+        scores = -1 * shapely.distance(inst, other_insts)
+    else:
+        raise NotImplementedError
+
+    return scores
+
+
+def flatten_meta_coordinates(df, annot_type):
+    """Helper function that adds the bbox corners or the point coordinates of the
+    instances meta as float columns, so that image_consensus reads them without
+    dereferencing the meta dicts of every image again:
+
+    :param df: Annotation data with "meta" column
+    :type df: pandas.DataFrame
+    :param annot_type: Type of annotation instances. Available candidates are: ["bbox", "polygon", "point"]
+    :type annot_type: str
+
+    """
+    columns = META_COORDINATE_COLUMNS.get(annot_type)
+    if not columns:
+        return df
+    if annot_type == "bbox":
+        keys = ("x1", "y1", "x2", "y2")
+        coordinates = [[meta["points"][key] for key in keys] for meta in df["meta"]]
+    else:
+        keys = ("x", "y")
+        coordinates = [[meta[key] for key in keys] for meta in df["meta"]]
+    coordinates = np.array(coordinates, dtype=float).reshape(-1, len(keys))
+    return df.assign(**{column: coordinates[:, i] for i, column in enumerate(columns)})
+
+
 def image_consensus(df, image_name, annot_type):
     """Helper function that computes consensus score for instances of a single image:
 
@@ -536,7 +660,37 @@ def image_consensus(df, image_name, annot_type):
 
     """
 
+    return _image_consensus(
+        df[df["imageName"] == image_name],
+        image_name,
+        annot_type,
+        len(set(df["folderName"])),
+    )
+
+
+def images_consensus(df, annot_type):
+    """Helper function that computes consensus score for instances of all images,
+    the data is split by image once instead of being filtered for every image:
+
+    :param df: Annotation data of all images
+    :type df: pandas.DataFrame
+    :param annot_type: Type of annotation instances to consider. Available candidates are: ["bbox", "polygon", "point"]
+    :type dataset_format: str
+
+    """
+    projects_count = len(set(df["folderName"]))
+    images_data = [
+        pd.DataFrame(
+            _image_consensus(image_df, image_name, annot_type, projects_count)
+        )
+        for image_name, image_df in df.groupby("imageName", sort=False)
+    ]
+    return pd.concat(images_data, ignore_index=True)
+
+
+def _image_consensus(image_df, image_name, annot_type, projects_count):
     try:
+        import shapely
         from shapely.geometry import box
         from shapely.geometry import Point
         from shapely.geometry import Polygon
@@ -546,8 +700,6 @@ def image_consensus(df, image_name, annot_type):
             "shapely package in Anaconda enviornment with # conda install shapely"
         )
 
-    image_df = df[df["imageName"] == image_name]
-    all_projects = list(set(df["folderName"]))
     column_names = [
         "creatorEmail",
         "imageName",
@@ -565,40 +717,77 @@ def image_consensus(df, image_name, annot_type):
 
     projects_shaply_objs = {}
     # generate shapely objects of instances
-    for _, row in image_df.iterrows():
-        if row["folderName"] not in projects_shaply_objs:
-            projects_shaply_objs[row["folderName"]] = []
-        inst_data = row["meta"]
-        if annot_type == "bbox":
-            inst_coords = inst_data["points"]
-            x1, x2 = inst_coords["x1"], inst_coords["x2"]
-            y1, y2 = inst_coords["y1"], inst_coords["y2"]
+    coordinate_columns = list(META_COORDINATE_COLUMNS.get(annot_type, ()))
+    if coordinate_columns and coordinate_columns[0] not in image_df:
+        image_df = flatten_meta_coordinates(image_df, annot_type)
+    instances_df = image_df[
+        ["folderName", "meta", "className", "creatorEmail", "attributes"]
+        + coordinate_columns
+    ]
+    instances = None
+    # shapely 2 creates the boxes and points of all the instances in one call
+    if annot_type == "bbox" and hasattr(shapely, "box"):
+        x1, y1, x2, y2 = instances_df[coordinate_columns].to_numpy(dtype=float).T
+        instances = shapely.box(
+            np.minimum(x1, x2),
+            np.minimum(y1, y2),
+            np.maximum(x1, x2),
+            np.maximum(y1, y2),
+        )
+    elif annot_type == "point" and hasattr(shapely, "points"):
+        instances = shapely.points(
+            instances_df[coordinate_columns].to_numpy(dtype=float)
+        )
+    for row_index, row in enumerate(instances_df.itertuples(index=False)):
+        folder_instances = projects_shaply_objs.setdefault(row.folderName, [])
+        if instances is not None:
+            inst = instances[row_index]
+        elif annot_type == "bbox":
+            x1, x2 = row.meta_x1, row.meta_x2
+            y1, y2 = row.meta_y1, row.meta_y2
             inst = box(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
         elif annot_type == "polygon":
-            inst_coords = inst_data["points"]
+            inst_coords = row.meta["points"]
             shapely_format = []
             for i in range(0, len(inst_coords) - 1, 2):
                 shapely_format.append((inst_coords[i], inst_coords[i + 1]))
             inst = Polygon(shapely_format)
         elif annot_type == "point":
-            inst = Point(inst_data["x"], inst_data["y"])
+            inst = Point(row.meta_x, row.meta_y)
         if inst.is_valid:
-            projects_shaply_objs[row["folderName"]].append(
-                (inst, row["className"], row["creatorEmail"], row["attributes"])
+            folder_instances.append(
+                (inst, row.className, row.creatorEmail, row.attributes)
             )
         else:
             logger.info(
                 "Invalid %s instance occured, skipping to the next one.", annot_type
             )
+    # arrays of the projects instance geometries, classes and visited flags let
+    # the match candidates be filtered without a Python loop
+    projects_geometries = {}
+    projects_classes = {}
     visited_instances = {}
     for proj, instances in projects_shaply_objs.items():
-        visited_instances[proj] = [False] * len(instances)
+        geometries = np.empty(len(instances), dtype=object)
+        classes = np.empty(len(instances), dtype=object)
+        for instance_index, instance in enumerate(instances):
+            geometries[instance_index], classes[instance_index] = instance[:2]
+        projects_geometries[proj] = geometries
+        projects_classes[proj] = classes
+        visited_instances[proj] = np.zeros(len(instances), dtype=bool)
+
+    # only intersecting instances can have a positive polygon/bbox score, spatial
+    # indexes of the projects give them without scoring every pair
+    projects_trees = {}
+    if annot_type in ["polygon", "bbox"] and hasattr(shapely, "STRtree"):
+        for proj, geometries in projects_geometries.items():
+            projects_trees[proj] = shapely.STRtree(geometries)
 
     # match instances
     for curr_proj, curr_proj_instances in projects_shaply_objs.items():
         for curr_id, curr_inst_data in enumerate(curr_proj_instances):
             curr_inst, curr_class, _, _ = curr_inst_data
-            if visited_instances[curr_proj][curr_id] == True:
+            if visited_instances[curr_proj][curr_id]:
                 continue
             max_instances = []
             for other_proj, other_proj_instances in projects_shaply_objs.items():
@@ -612,15 +801,35 @@ def image_consensus(df, image_name, annot_type):
                         max_score = float("-inf")
                     max_inst_data = None
                     max_inst_id = -1
-                    for other_id, other_inst_data in enumerate(other_proj_instances):
-                        other_inst, other_class, _, _ = other_inst_data
-                        if visited_instances[other_proj][other_id] == True:
-                            continue
-                        score = instance_consensus(curr_inst, other_inst)
-                        if score > max_score and other_class == curr_class:
-                            max_score = score
-                            max_inst_data = other_inst_data
-                            max_inst_id = other_id
+                    if other_proj in projects_trees:
+                        other_ids = np.sort(
+                            projects_trees[other_proj].query(
+                                curr_inst, predicate="intersects"
+                            )
+                        )
+                    else:
+                        other_ids = np.arange(len(other_proj_instances))
+                    other_ids = other_ids[
+                        ~visited_instances[other_proj][other_ids]
+                        & (projects_classes[other_proj][other_ids] == curr_class)
+                    ]
+                    if other_ids.size and hasattr(shapely, "area"):
+                        scores = instances_consensus(
+                            curr_inst, projects_geometries[other_proj][other_ids]
+                        )
+                        # argmax gives the first of the best scores as the loop did
+                        best_id = int(np.argmax(scores))
+                        if scores[best_id] > max_score:
+                            max_inst_id = int(other_ids[best_id])
+                            max_inst_data = other_proj_instances[max_inst_id]
+                    else:
+                        for other_id in other_ids.tolist():
+                            other_inst_data = other_proj_instances[other_id]
+                            score = instance_consensus(curr_inst, other_inst_data[0])
+                            if score > max_score:
+                                max_score = score
+                                max_inst_data = other_inst_data
+                                max_inst_id = other_id
                     if max_inst_data is not None:
                         max_instances.append((other_proj, *max_inst_data))
                         visited_instances[other_proj][max_inst_id] = True
@@ -649,18 +858,18 @@ def image_consensus(df, image_name, annot_type):
                     image_data["instanceId"].append(instance_id)
                     image_data["className"].append(curr_match_data[2])
                     image_data["folderName"].append(curr_match_data[0])
-                    image_data["score"].append(proj_cons / (len(all_projects) - 1))
+                    image_data["score"].append(proj_cons / (projects_count - 1))
             instance_id += 1
 
     return image_data
 
 
 def consensus_plot(consensus_df, *_, **__):
-    plot_data = consensus_df.copy()
+    # plotly does not modify the frame, each figure gets only the columns it uses
 
     # annotator-wise boxplot
     annot_box_fig = px.box(
-        plot_data,
+        consensus_df[["creatorEmail", "score"]],
         x="creatorEmail",
         y="score",
         points="all",
@@ -671,7 +880,7 @@ def consensus_plot(consensus_df, *_, **__):
 
     # project-wise boxplot
     project_box_fig = px.box(
-        plot_data,
+        consensus_df[["folderName", "score"]],
         x="folderName",
         y="score",
         points="all",
@@ -682,7 +891,9 @@ def consensus_plot(consensus_df, *_, **__):
 
     # scatter plot of score vs area
     fig = px.scatter(
-        plot_data,
+        consensus_df[
+            ["area", "score", "className", "creatorEmail", "folderName", "imageName"]
+        ],
         x="area",
         y="score",
         color="className",
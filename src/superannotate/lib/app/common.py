@@ -126,7 +126,7 @@ def save_desktop_format(output_dir, classes, files_dict):
         )
 
         img = Image.open(output_dir / "images" / file_name)
-        img.thumbnail((168, 120), Image.ANTIALIAS)
+        img.thumbnail((168, 120), Image.LANCZOS)
         img.save(output_dir / "images" / "thumb" / ("thmb_" + file_name + ".jpg"))
 
     with open(output_dir / "images" / "images.sa", "w") as fw:
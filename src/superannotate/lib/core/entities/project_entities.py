@@ -1,5 +1,3 @@
-from abc import ABC
-from abc import abstractmethod
 from typing import Any
 from typing import Iterable
 from typing import List
@@ -7,7 +5,45 @@ from typing import List
 from lib.core.enums import SegmentationStatus
 
 
-class BaseEntity(ABC):
+class BaseEntity:
+    __slots__ = ("_uuid",)
+
+    # (key, attribute) pairs of the to_dict entries, subclasses declaring them get
+    # a to_dict generated as a single dict literal of the attributes
+    _DICT_FIELDS = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the pickle and copy state is the flat tuple of the slots of the whole
+        # hierarchy instead of the default dict of slot names to values
+        slots = ", ".join(
+            f"self.{slot}"
+            for klass in reversed(cls.__mro__)
+            for slot in klass.__dict__.get("__slots__", ())
+        )
+        namespace = {}
+        exec(
+            f"def __getstate__(self):\n    return ({slots},)\n"
+            f"def __setstate__(self, state):\n    ({slots},) = state\n",
+            namespace,
+        )
+        cls.__getstate__ = namespace["__getstate__"]
+        cls.__setstate__ = namespace["__setstate__"]
+
+        if "_DICT_FIELDS" not in cls.__dict__:
+            return
+        items = ", ".join(
+            f"{key!r}: self.{attribute}" for key, attribute in cls._DICT_FIELDS
+        )
+        namespace = {}
+        exec(f"def fields_to_dict(self):\n    return {{{items}}}\n", namespace)
+        fields_to_dict = namespace["fields_to_dict"]
+        fields_to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+
+        cls._fields_to_dict = fields_to_dict
+        if "to_dict" not in cls.__dict__:
+            cls.to_dict = fields_to_dict
+
     def __init__(self, uuid: Any = None):
         self._uuid = uuid
 
@@ -19,12 +55,19 @@ class BaseEntity(ABC):
     def uuid(self, value: Any):
         self._uuid = value
 
-    @abstractmethod
     def to_dict(self):
         raise NotImplementedError
 
 
 class BaseTimedEntity(BaseEntity):
+    __slots__ = ("createdAt", "updatedAt")
+
+    _DICT_FIELDS = (
+        ("id", "_uuid"),
+        ("createdAt", "createdAt"),
+        ("updatedAt", "updatedAt"),
+    )
+
     def __init__(
         self, uuid: Any = None, createdAt: str = None, updatedAt: str = None,
     ):
@@ -32,15 +75,12 @@ class BaseTimedEntity(BaseEntity):
         self.createdAt = createdAt
         self.updatedAt = updatedAt
 
-    def to_dict(self):
-        return {
-            "id": self.uuid,
-            "createdAt": self.createdAt,
-            "updatedAt": self.updatedAt,
-        }
-
 
 class ConfigEntity(BaseEntity):
+    __slots__ = ("_value",)
+
+    _DICT_FIELDS = (("key", "_uuid"), ("value", "_value"))
+
     def __init__(self, uuid: str, value: str):
         super().__init__(uuid)
         self._value = value
@@ -53,11 +93,48 @@ class ConfigEntity(BaseEntity):
     def value(self, value):
         self._value = value
 
-    def to_dict(self):
-        return {"key": self.uuid, "value": self.value}
-
 
 class ProjectEntity(BaseTimedEntity):
+    __slots__ = (
+        "team_id",
+        "name",
+        "project_type",
+        "description",
+        "attachment_name",
+        "attachment_path",
+        "creator_id",
+        "entropy_status",
+        "sharing_status",
+        "status",
+        "folder_id",
+        "upload_state",
+        "users",
+        "contributors",
+        "settings",
+        "annotation_classes",
+        "workflow",
+        "completed_images_count",
+        "root_folder_completed_images_count",
+    )
+
+    _DICT_FIELDS = BaseTimedEntity._DICT_FIELDS + (
+        ("team_id", "team_id"),
+        ("name", "name"),
+        ("type", "project_type"),
+        ("description", "description"),
+        ("status", "status"),
+        ("attachment_path", "attachment_path"),
+        ("attachment_name", "attachment_name"),
+        ("entropy_status", "entropy_status"),
+        ("sharing_status", "sharing_status"),
+        ("creator_id", "creator_id"),
+        ("folder_id", "folder_id"),
+        ("upload_state", "upload_state"),
+        ("users", "users"),
+        ("completed_images_count", "completed_images_count"),
+        ("rootFolderCompletedImagesCount", "root_folder_completed_images_count"),
+    )
+
     def __init__(
         self,
         uuid: int = None,
@@ -116,28 +193,17 @@ class ProjectEntity(BaseTimedEntity):
             upload_state=self.upload_state,
         )
 
-    def to_dict(self):
-        return {
-            **super().to_dict(),
-            "team_id": self.team_id,
-            "name": self.name,
-            "type": self.project_type,
-            "description": self.description,
-            "status": self.status,
-            "attachment_path": self.attachment_path,
-            "attachment_name": self.attachment_name,
-            "entropy_status": self.entropy_status,
-            "sharing_status": self.sharing_status,
-            "creator_id": self.creator_id,
-            "folder_id": self.folder_id,
-            "upload_state": self.upload_state,
-            "users": self.users,
-            "completed_images_count": self.completed_images_count,
-            "rootFolderCompletedImagesCount": self.root_folder_completed_images_count,
-        }
-
 
 class ProjectSettingEntity(BaseEntity):
+    __slots__ = ("project_id", "attribute", "value")
+
+    _DICT_FIELDS = (
+        ("id", "_uuid"),
+        ("project_id", "project_id"),
+        ("attribute", "attribute"),
+        ("value", "value"),
+    )
+
     def __init__(
         self,
         uuid: int = None,
@@ -153,16 +219,19 @@ class ProjectSettingEntity(BaseEntity):
     def __copy__(self):
         return ProjectSettingEntity(attribute=self.attribute, value=self.value)
 
-    def to_dict(self):
-        return {
-            "id": self.uuid,
-            "project_id": self.project_id,
-            "attribute": self.attribute,
-            "value": self.value,
-        }
-
 
 class WorkflowEntity(BaseEntity):
+    __slots__ = ("project_id", "class_id", "step", "tool", "attribute")
+
+    _DICT_FIELDS = (
+        ("id", "_uuid"),
+        ("project_id", "project_id"),
+        ("class_id", "class_id"),
+        ("step", "step"),
+        ("tool", "tool"),
+        ("attribute", "attribute"),
+    )
+
     def __init__(
         self,
         uuid: int = None,
@@ -170,7 +239,7 @@ class WorkflowEntity(BaseEntity):
         class_id: int = None,
         step: int = None,
         tool: int = None,
-        attribute: Iterable = tuple(),
+        attribute: Iterable = (),
     ):
         super().__init__(uuid)
         self.project_id = project_id
@@ -182,18 +251,18 @@ class WorkflowEntity(BaseEntity):
     def __copy__(self):
         return WorkflowEntity(step=self.step, tool=self.tool, attribute=self.attribute)
 
-    def to_dict(self):
-        return {
-            "id": self.uuid,
-            "project_id": self.project_id,
-            "class_id": self.class_id,
-            "step": self.step,
-            "tool": self.tool,
-            "attribute": self.attribute,
-        }
-
 
 class FolderEntity(BaseTimedEntity):
+    __slots__ = ("team_id", "project_id", "name", "parent_id", "folder_users")
+
+    _DICT_FIELDS = BaseTimedEntity._DICT_FIELDS + (
+        ("team_id", "team_id"),
+        ("name", "name"),
+        ("parent_id", "parent_id"),
+        ("project_id", "project_id"),
+        ("folder_users", "folder_users"),
+    )
+
     def __init__(
         self,
         uuid: int = None,
@@ -212,19 +281,12 @@ class FolderEntity(BaseTimedEntity):
         self.parent_id = parent_id
         self.folder_users = folder_users
 
-    def to_dict(self):
-        return {
-            **super().to_dict(),
-            "id": self.uuid,
-            "team_id": self.team_id,
-            "name": self.name,
-            "parent_id": self.parent_id,
-            "project_id": self.project_id,
-            "folder_users": self.folder_users,
-        }
-
 
 class ImageInfoEntity(BaseEntity):
+    __slots__ = ("width", "height")
+
+    _DICT_FIELDS = (("width", "width"), ("height", "height"))
+
     def __init__(
         self, uuid=None, width: float = None, height: float = None,
     ):
@@ -232,14 +294,46 @@ class ImageInfoEntity(BaseEntity):
         self.width = width
         self.height = height
 
-    def to_dict(self):
-        return {
-            "width": self.width,
-            "height": self.height,
-        }
-
 
 class ImageEntity(BaseEntity):
+    __slots__ = (
+        "team_id",
+        "name",
+        "path",
+        "project_id",
+        "annotation_status_code",
+        "folder_id",
+        "qa_id",
+        "qa_name",
+        "entropy_value",
+        "approval_status",
+        "annotator_id",
+        "annotator_name",
+        "is_pinned",
+        "segmentation_status",
+        "prediction_status",
+        "meta",
+    )
+
+    _DICT_FIELDS = (
+        ("id", "_uuid"),
+        ("team_id", "team_id"),
+        ("name", "name"),
+        ("path", "path"),
+        ("project_id", "project_id"),
+        ("annotation_status", "annotation_status_code"),
+        ("folder_id", "folder_id"),
+        ("qa_id", "qa_id"),
+        ("qa_name", "qa_name"),
+        ("entropy_value", "entropy_value"),
+        ("approval_status", "approval_status"),
+        ("annotator_id", "annotator_id"),
+        ("annotator_name", "annotator_name"),
+        ("is_pinned", "is_pinned"),
+        ("segmentation_status", "segmentation_status"),
+        ("prediction_status", "prediction_status"),
+    )
+
     def __init__(
         self,
         uuid: int = None,
@@ -258,7 +352,7 @@ class ImageEntity(BaseEntity):
         is_pinned: bool = None,
         segmentation_status: int = SegmentationStatus.NOT_STARTED.value,
         prediction_status: int = SegmentationStatus.NOT_STARTED.value,
-        meta: ImageInfoEntity = ImageInfoEntity(),
+        meta: ImageInfoEntity = None,
         **_
     ):
         super().__init__(uuid)
@@ -266,19 +360,18 @@ class ImageEntity(BaseEntity):
         self.name = name
         self.path = path
         self.project_id = project_id
-        self.project_id = project_id
         self.annotation_status_code = annotation_status_code
         self.folder_id = folder_id
         self.qa_id = qa_id
         self.qa_name = qa_name
         self.entropy_value = entropy_value
-        self.annotator_id = annotator_id
         self.approval_status = approval_status
+        self.annotator_id = annotator_id
         self.annotator_name = annotator_name
         self.is_pinned = is_pinned
         self.segmentation_status = segmentation_status
         self.prediction_status = prediction_status
-        self.meta = meta
+        self.meta = meta if meta is not None else ImageInfoEntity()
 
     @staticmethod
     def from_dict(**kwargs):
@@ -290,39 +383,68 @@ class ImageEntity(BaseEntity):
             del kwargs["annotation_status"]
         return ImageEntity(**kwargs)
 
+    @classmethod
+    def bulk_from_records(cls, records: Iterable[dict]) -> List["ImageEntity"]:
+        """Builds the entities of the records like from_dict, but fills the slots
+        directly instead of passing every record as keyword arguments to __init__.
+        """
+        not_started = SegmentationStatus.NOT_STARTED.value
+        new = cls.__new__
+        entities = []
+        for record in records:
+            get = record.get
+            entity = new(cls)
+            entity._uuid = get("id", get("uuid"))
+            entity.team_id = get("team_id")
+            entity.name = get("name")
+            entity.path = get("path")
+            entity.project_id = get("project_id")
+            entity.annotation_status_code = get(
+                "annotation_status", get("annotation_status_code")
+            )
+            entity.folder_id = get("folder_id")
+            entity.qa_id = get("qa_id")
+            entity.qa_name = get("qa_name")
+            entity.entropy_value = get("entropy_value")
+            entity.approval_status = get("approval_status")
+            entity.annotator_id = get("annotator_id")
+            entity.annotator_name = get("annotator_name")
+            entity.is_pinned = get("is_pinned")
+            entity.segmentation_status = get("segmentation_status", not_started)
+            entity.prediction_status = get("prediction_status", not_started)
+            meta = get("meta")
+            entity.meta = meta if meta is not None else ImageInfoEntity()
+            entities.append(entity)
+        return entities
+
     def to_dict(self):
-        return {
-            "id": self.uuid,
-            "team_id": self.team_id,
-            "name": self.name,
-            "path": self.path,
-            "project_id": self.project_id,
-            "annotation_status": self.annotation_status_code,
-            "folder_id": self.folder_id,
-            "qa_id": self.qa_id,
-            "qa_name": self.qa_name,
-            "entropy_value": self.entropy_value,
-            "approval_status": self.approval_status,
-            "annotator_id": self.annotator_id,
-            "annotator_name": self.annotator_name,
-            "is_pinned": self.is_pinned,
-            "segmentation_status": self.segmentation_status,
-            "prediction_status": self.prediction_status,
-            "meta": self.meta.to_dict(),
-        }
+        data = self._fields_to_dict()
+        data["meta"] = self.meta.to_dict()
+        return data
 
 
 class S3FileEntity(BaseEntity):
+    __slots__ = ("data", "metadata")
+
+    _DICT_FIELDS = (("uuid", "_uuid"), ("bytes", "data"), ("metadata", "metadata"))
+
     def __init__(self, uuid, data, metadata: dict = None):
         super().__init__(uuid)
         self.data = data
         self.metadata = metadata
 
-    def to_dict(self):
-        return {"uuid": self.uuid, "bytes": self.data, "metadata": self.metadata}
-
 
 class AnnotationClassEntity(BaseTimedEntity):
+    __slots__ = ("color", "count", "name", "project_id", "attribute_groups")
+
+    _DICT_FIELDS = BaseTimedEntity._DICT_FIELDS + (
+        ("color", "color"),
+        ("count", "count"),
+        ("name", "name"),
+        ("project_id", "project_id"),
+        ("attribute_groups", "attribute_groups"),
+    )
+
     def __init__(
         self,
         uuid: int = None,
@@ -340,8 +462,6 @@ class AnnotationClassEntity(BaseTimedEntity):
         self.name = name
         self.project_id = project_id
         self.attribute_groups = attribute_groups
-        self.createdAt = createdAt
-        self.updatedAt = updatedAt
 
     def __copy__(self):
         return AnnotationClassEntity(
@@ -352,17 +472,24 @@ class AnnotationClassEntity(BaseTimedEntity):
         )
 
     def to_dict(self):
-        return {
-            **super().to_dict(),
-            "color": self.color,
-            "count": self.count,
-            "name": self.name,
-            "project_id": self.project_id,
-            "attribute_groups": self.attribute_groups if self.attribute_groups else [],
-        }
+        data = self._fields_to_dict()
+        if not data["attribute_groups"]:
+            data["attribute_groups"] = []
+        return data
 
 
 class UserEntity(BaseEntity):
+    __slots__ = ("first_name", "last_name", "email", "picture", "user_role")
+
+    _DICT_FIELDS = (
+        ("id", "_uuid"),
+        ("first_name", "first_name"),
+        ("last_name", "last_name"),
+        ("email", "email"),
+        ("picture", "picture"),
+        ("user_role", "user_role"),
+    )
+
     def __init__(
         self,
         uuid: int = None,
@@ -379,18 +506,31 @@ class UserEntity(BaseEntity):
         self.picture = picture
         self.user_role = user_role
 
-    def to_dict(self):
-        return {
-            "id": self.uuid,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "email": self.email,
-            "picture": self.picture,
-            "user_role": self.user_role,
-        }
-
 
 class TeamEntity(BaseEntity):
+    __slots__ = (
+        "name",
+        "description",
+        "team_type",
+        "user_role",
+        "is_default",
+        "users",
+        "pending_invitations",
+        "creator_id",
+    )
+
+    _DICT_FIELDS = (
+        ("id", "_uuid"),
+        ("name", "name"),
+        ("description", "description"),
+        ("type", "team_type"),
+        ("user_role", "user_role"),
+        ("is_default", "is_default"),
+        ("users", "users"),
+        ("pending_invitations", "pending_invitations"),
+        ("creator_id", "creator_id"),
+    )
+
     def __init__(
         self,
         uuid: int = None,
@@ -414,20 +554,49 @@ class TeamEntity(BaseEntity):
         self.creator_id = creator_id
 
     def to_dict(self):
-        return {
-            "id": self.uuid,
-            "name": self.name,
-            "description": self.description,
-            "type": self.team_type,
-            "user_role": self.user_role,
-            "is_default": self.is_default,
-            "users": [user.to_dict() for user in self.users],
-            "pending_invitations": self.pending_invitations,
-            "creator_id": self.creator_id,
-        }
+        data = self._fields_to_dict()
+        data["users"] = [user.to_dict() for user in self.users]
+        return data
 
 
 class MLModelEntity(BaseTimedEntity):
+    __slots__ = (
+        "name",
+        "path",
+        "team_id",
+        "config_path",
+        "output_path",
+        "model_type",
+        "description",
+        "task",
+        "base_model_id",
+        "image_count",
+        "training_status",
+        "test_folder_ids",
+        "train_folder_ids",
+        "is_trainable",
+        "is_global",
+        "hyper_parameters",
+    )
+
+    _DICT_FIELDS = BaseTimedEntity._DICT_FIELDS + (
+        ("name", "name"),
+        ("team_id", "team_id"),
+        ("description", "description"),
+        ("task", "task"),
+        ("project_type", "model_type"),
+        ("path", "path"),
+        ("config_path", "config_path"),
+        ("output_path", "output_path"),
+        ("base_model_id", "base_model_id"),
+        ("image_count", "image_count"),
+        ("training_status", "training_status"),
+        ("test_folder_ids", "test_folder_ids"),
+        ("train_folder_ids", "train_folder_ids"),
+        ("is_trainable", "is_trainable"),
+        ("is_global", "is_global"),
+    )
+
     def __init__(
         self,
         uuid: int = None,
@@ -448,7 +617,7 @@ class MLModelEntity(BaseTimedEntity):
         train_folder_ids: List[int] = None,
         is_trainable: bool = None,
         is_global: bool = None,
-        hyper_parameters: dict = {},
+        hyper_parameters: dict = None,
     ):
         super().__init__(uuid, createdAt, updatedAt)
         self.name = name
@@ -466,25 +635,9 @@ class MLModelEntity(BaseTimedEntity):
         self.train_folder_ids = train_folder_ids
         self.is_trainable = is_trainable
         self.is_global = is_global
-        self.hyper_parameters = hyper_parameters
+        self.hyper_parameters = hyper_parameters if hyper_parameters is not None else {}
 
     def to_dict(self):
-        return {
-            **super().to_dict(),
-            "name": self.name,
-            "team_id": self.team_id,
-            "description": self.description,
-            "task": self.task,
-            "project_type": self.model_type,
-            "path": self.path,
-            "config_path": self.config_path,
-            "output_path": self.output_path,
-            "base_model_id": self.base_model_id,
-            "image_count": self.image_count,
-            "training_status": self.training_status,
-            "test_folder_ids": self.test_folder_ids,
-            "train_folder_ids": self.train_folder_ids,
-            "is_trainable": self.is_trainable,
-            "is_global": self.is_global,
-            **self.hyper_parameters,
-        }
+        data = self._fields_to_dict()
+        data.update(self.hyper_parameters)
+        return data
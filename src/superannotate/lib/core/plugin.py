@@ -1,3 +1,4 @@
+import concurrent.futures
 import io
 import logging
 from pathlib import Path
@@ -7,22 +8,90 @@ from typing import Union
 
 import cv2
 import ffmpeg
+import numpy as np
 from lib.core.exceptions import ImageProcessingException
 from PIL import Image
 from PIL import ImageDraw
-from PIL import ImageOps
+
+try:
+    from turbojpeg import TJPF_BGR
+    from turbojpeg import TJPF_RGBA
+    from turbojpeg import TurboJPEG
+
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
 
 logger = logging.getLogger()
 
+JPEG_QUALITY = 95
+FRAME_WRITE_WORKERS = 4
+
+EXIF_ORIENTATION_TAG = 0x0112
+
 
 class ImagePlugin:
-    def __init__(self, image_bytes: io.BytesIO, max_resolution: int = 4096):
-        self._image_bytes = image_bytes
-        self._image_bytes.seek(0)
+    def __init__(
+        self,
+        image_bytes: Union[io.BytesIO, bytes, str, Path],
+        max_resolution: int = 4096,
+    ):
+        if isinstance(image_bytes, (str, Path)):
+            # PIL reads from its own buffered file object, no intermediate copy
+            self._image_bytes = str(image_bytes)
+        elif isinstance(image_bytes, bytes):
+            # BytesIO shares the bytes object until it is written to
+            self._image_bytes = io.BytesIO(image_bytes)
+        else:
+            self._image_bytes = image_bytes
+            self._image_bytes.seek(0)
         self._max_resolution = max_resolution
-        self._image = Image.open(self._image_bytes).convert("RGBA")
+        # only the header is read here, the full RGBA decode is deferred until
+        # the pixels are needed, thumb and huge are decoded from JPEG drafts
+        image = Image.open(self._image_bytes)
+        self._format = image.format
+        self._size = image.size
+        self._has_alpha = "A" in image.mode or "transparency" in image.info
+        if isinstance(self._image_bytes, str):
+            image.close()
+        self._decoded_image = None
         self._draw = None
 
+    @property
+    def _image(self) -> Image.Image:
+        if self._decoded_image is None:
+            self._decoded_image = self._decode()
+        return self._decoded_image
+
+    @_image.setter
+    def _image(self, image: Image.Image):
+        self._decoded_image = image
+
+    def _decode(self) -> Image.Image:
+        image = self._open()
+        if _turbo_jpeg and self._format == "JPEG" and image.mode in ("RGB", "L"):
+            # libjpeg-turbo decodes straight to RGBA, no PIL decode and convert
+            decoded = Image.fromarray(
+                _turbo_jpeg.decode(self._read_bytes(), pixel_format=TJPF_RGBA), "RGBA"
+            )
+            decoded.info = image.info.copy()
+            if isinstance(self._image_bytes, str):
+                image.close()
+            return decoded
+        return image.convert("RGBA")
+
+    def _open(self) -> Image.Image:
+        if not isinstance(self._image_bytes, str):
+            self._image_bytes.seek(0)
+        return Image.open(self._image_bytes)
+
+    def _read_bytes(self) -> Union[bytes, memoryview]:
+        if isinstance(self._image_bytes, str):
+            with open(self._image_bytes, "rb") as file:
+                return file.read()
+        # a view of the buffer contents, getvalue would copy them
+        return self._image_bytes.getbuffer()
+
     def save(self, *args, **kwargs):
         self._image.save(*args, **kwargs)
 
@@ -42,11 +111,11 @@ class ImagePlugin:
         self._image.show()
 
     def get_empty_image(self):
-        return Image.new("RGBA", self._image.size)
+        return Image.new("RGBA", self._size)
 
     def get_empty(self):
         image_bytes = io.BytesIO()
-        Image.new("RGB", self._image.size).save(image_bytes, "jpeg")
+        Image.new("RGB", self._size).save(image_bytes, "jpeg")
         image_bytes.seek(0)
         return ImagePlugin(image_bytes=image_bytes)
 
@@ -56,13 +125,9 @@ class ImagePlugin:
             self._draw = ImageDraw.Draw(self._image)
         return self._draw
 
-    def _get_image(self):
+    def _get_image(self, image: Image.Image = None):
         Image.MAX_IMAGE_PIXELS = None
-        im = self._image
-
-        im = ImageOps.exif_transpose(im)
-
-        width, height = im.size
+        width, height = self._size
 
         resolution = width * height
 
@@ -70,48 +135,155 @@ class ImagePlugin:
             raise ImageProcessingException(
                 f"Image resolution {resolution} too large. Max supported for resolution is {self._max_resolution}"
             )
-        return im
+        return image if image is not None else self._image
+
+    def _get_draft(self, size: Tuple[int, int]) -> Image.Image:
+        """
+        For JPEG sources re-open the original bytes and let the decoder scale
+        the image down (DCT scaling) to the smallest size not less than size.
+        The draft must be set on a freshly opened, not yet loaded, image.
+        """
+        if self._format != "JPEG":
+            return self._image
+        image = self._open()
+        image.draft("RGB", size)
+        return image
 
     def get_size(self) -> Tuple[float, float]:
-        return self._image.size
+        return self._size
 
-    def generate_thumb(self):
-        image = self._get_image()
+    @staticmethod
+    def _get_orientation_matrix(
+        orientation: int, width: int, height: int, offset: Tuple[int, int]
+    ) -> np.ndarray:
+        """
+        Returns the affine matrix which applies the EXIF orientation to a
+        width x height image and moves it by offset.
+        """
+        x_offset, y_offset = offset
+        matrices = {
+            2: [[-1, 0, width - 1], [0, 1, 0]],
+            3: [[-1, 0, width - 1], [0, -1, height - 1]],
+            4: [[1, 0, 0], [0, -1, height - 1]],
+            5: [[0, 1, 0], [1, 0, 0]],
+            6: [[0, -1, height - 1], [1, 0, 0]],
+            7: [[0, -1, height - 1], [-1, 0, width - 1]],
+            8: [[0, 1, 0], [-1, 0, width - 1]],
+        }
+        matrix = np.array(
+            matrices.get(orientation, [[1, 0, 0], [0, 1, 0]]), dtype=np.float32
+        )
+        matrix[:, 2] += (x_offset, y_offset)
+        return matrix
+
+    @classmethod
+    def _save_thumb(cls, image: Image.Image) -> Tuple[io.BytesIO, float, float]:
+        """
+        Scales the image down with area interpolation, then the EXIF orientation
+        and the centering on the black background are done in a single warpAffine
+        pass over the thumbnail sized image.
+        """
         buffer = io.BytesIO()
 
         thumbnail_size = (128, 96)
-        background = Image.new("RGB", thumbnail_size, "black")
-        image.thumbnail(thumbnail_size, Image.ANTIALIAS)
-        (w, h) = image.size
-        background.paste(
-            image, ((thumbnail_size[0] - w) // 2, (thumbnail_size[1] - h) // 2)
+        orientation = image.getexif().get(EXIF_ORIENTATION_TAG, 1)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+        width, height = image.size
+        transposed = orientation in (5, 6, 7, 8)
+        oriented_width, oriented_height = (
+            (height, width) if transposed else (width, height)
+        )
+        scale = min(
+            thumbnail_size[0] / oriented_width, thumbnail_size[1] / oriented_height, 1
+        )
+        w = max(round(oriented_width * scale), 1)
+        h = max(round(oriented_height * scale), 1)
+        scaled_size = (h, w) if transposed else (w, h)
+        array = np.asarray(image)[..., :3]
+        if scaled_size != (width, height):
+            array = cv2.resize(array, scaled_size, interpolation=cv2.INTER_AREA)
+        matrix = cls._get_orientation_matrix(
+            orientation,
+            *scaled_size,
+            offset=((thumbnail_size[0] - w) // 2, (thumbnail_size[1] - h) // 2),
+        )
+        im = Image.fromarray(
+            cv2.warpAffine(
+                array,
+                matrix,
+                thumbnail_size,
+                flags=cv2.INTER_NEAREST,
+                borderMode=cv2.BORDER_CONSTANT,
+                borderValue=(0, 0, 0),
+            )
         )
-        im = background
         im.save(buffer, "JPEG")
 
         buffer.seek(0)
         width, height = im.size
         return buffer, width, height
 
+    @staticmethod
+    def _resize(image: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        """
+        Downscales with OpenCV area interpolation (vectorized and multithreaded),
+        upscaling and modes OpenCV can't handle are resized with PIL.
+        """
+        if image.mode not in ("RGB", "RGBA", "L") or size[0] >= image.size[0]:
+            return image.resize(size, Image.LANCZOS)
+        resized = Image.fromarray(
+            cv2.resize(np.asarray(image), size, interpolation=cv2.INTER_AREA)
+        )
+        resized.info = image.info.copy()
+        return resized
+
+    def _get_huge_size(self, base_width: int) -> Tuple[int, int]:
+        width, height = self._size
+        return base_width, int(height * base_width / width)
+
+    def generate_thumb(self):
+        draft_size = 256
+        image = self._get_image(self._get_draft((draft_size, draft_size)))
+        return self._save_thumb(image)
+
     def generate_huge(self, base_width: int = 600) -> Tuple[io.BytesIO, float, float]:
-        im = self._image
-        width, height = im.size
+        width, height = self._size
         buffer = io.BytesIO()
-        h_size = int(height * base_width / width)
-        im.resize((base_width, h_size), Image.ANTIALIAS).convert("RGB").save(
-            buffer, "JPEG"
-        )
+        huge_size = self._get_huge_size(base_width)
+        im = self._get_draft((huge_size[0] * 2, huge_size[1] * 2))
+        self._resize(im, huge_size).convert("RGB").save(buffer, "JPEG")
         buffer.seek(0)
-        width, height = im.size
         return buffer, width, height
 
+    def generate_all(self, base_width: int = 600) -> dict:
+        """
+        Generates thumb and huge images from a single draft decode of the source,
+        the thumb is downscaled from the huge image instead of the source.
+        For JPEG sources the full size image is not decoded.
+        Returns dict with "thumb" and "huge" keys, values are the same as
+        generate_thumb and generate_huge return.
+        """
+        width, height = self._size
+        huge_size = self._get_huge_size(base_width)
+        huge = self._resize(
+            self._get_draft((huge_size[0] * 2, huge_size[1] * 2)), huge_size
+        )
+        thumb = self._save_thumb(self._get_image(huge))
+        buffer = io.BytesIO()
+        huge.convert("RGB").save(buffer, "JPEG")
+        buffer.seek(0)
+        return {"thumb": thumb, "huge": (buffer, width, height)}
+
     def generate_low_resolution(self, quality: int = 60, subsampling: int = -1):
         im = self._image
         buffer = io.BytesIO()
-        bg = Image.new("RGBA", im.size, (255, 255, 255))
-        im = im.convert("RGBA")
-        bg.paste(im, mask=im)
-        bg = bg.convert("RGB")
+        if self._has_alpha:
+            bg = Image.new("RGBA", im.size, (255, 255, 255))
+            bg.paste(im, mask=im)
+            bg = bg.convert("RGB")
+        else:
+            bg = im.convert("RGB")
         bg.save(buffer, "JPEG", quality=quality, subsampling=subsampling)
         buffer.seek(0)
         width, height = im.size
@@ -173,16 +345,31 @@ class VideoPlugin:
     @staticmethod
     def get_frames_count(video_path: str):
         video = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+        count = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        if count > 0:
+            return count
+        # container has no frame count, fall back to demuxing the stream
         count = 0
-        flag = True
-        while flag:
-            flag, _ = video.read()
-            if flag:
-                count += 1
-            else:
-                break
+        while video.grab():
+            count += 1
         return count
 
+    @staticmethod
+    def write_frame(path: str, frame):
+        """
+        Encode a BGR frame to JPEG. A shared libjpeg-turbo handle is reused when
+        PyTurboJPEG is installed, otherwise falls back to cv2.imwrite.
+        """
+        if _turbo_jpeg:
+            with open(path, "wb") as file:
+                file.write(
+                    _turbo_jpeg.encode(
+                        frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR
+                    )
+                )
+        else:
+            cv2.imwrite(path, frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+
     @staticmethod
     def get_fps(video_path: str) -> Union[int, float]:
         video = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
@@ -218,7 +405,12 @@ class VideoPlugin:
 
     @staticmethod
     def frames_generator(
-        video_path: str, start_time, end_time, target_fps: float, log=True
+        video_path: str,
+        start_time,
+        end_time,
+        target_fps: float,
+        log=True,
+        retrieve=True,
     ):
         video = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
         if not video.isOpened():
@@ -234,19 +426,40 @@ class VideoPlugin:
         rotate_code = VideoPlugin.get_video_rotate_code(video_path, log)
         frame_no = 0
         frame_no_with_change = 1.0
+        next_frame_no = 1
+        # skip decoding frames up to a second before start_time, the sampling
+        # position is advanced over the skipped frames to keep the same frames
+        skip_frames = int((start_time - 1) * fps) if start_time else 0
+        if skip_frames > 0:
+            video.set(cv2.CAP_PROP_POS_FRAMES, skip_frames)
+            if int(video.get(cv2.CAP_PROP_POS_FRAMES)) == skip_frames:
+                frame_no = skip_frames
+                while next_frame_no <= frame_no:
+                    frame_no_with_change += ratio
+                    next_frame_no = round(frame_no_with_change)
+            else:
+                video.release()
+                video = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
         while True:
-            success, frame = video.read()
-            if not success:
+            # grab only demuxes/decodes, the BGR frame is retrieved for sampled frames
+            if not video.grab():
                 break
             frame_no += 1
-            if round(frame_no_with_change) != frame_no:
+            if frame_no != next_frame_no:
                 continue
             frame_no_with_change += ratio
+            next_frame_no = round(frame_no_with_change)
             frame_time = video.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
             if end_time and frame_time > end_time:
                 break
             if frame_time < start_time:
                 continue
+            if not retrieve:
+                yield None
+                continue
+            success, frame = video.retrieve()
+            if not success:
+                break
             if rotate_code:
                 frame = cv2.rotate(frame, rotate_code)
             yield frame
@@ -259,7 +472,7 @@ class VideoPlugin:
         total_with_fps = sum(
             1
             for _ in VideoPlugin.frames_generator(
-                video_path, start_time, end_time, target_fps, log=False
+                video_path, start_time, end_time, target_fps, log=False, retrieve=False
             )
         )
         zero_fill_count = len(str(total))
@@ -282,28 +495,33 @@ class VideoPlugin:
     ) -> List[str]:
         total_num_of_frames = VideoPlugin.get_frames_count(video_path)
         zero_fill_count = len(str(total_num_of_frames))
-        video_name = Path(video_path).stem
+        path_prefix = f"{Path(extract_path) / Path(video_path).stem}_"
         extracted_frame_no = 1
         extracted_frames_paths = []
-        for frame in VideoPlugin.frames_generator(
-            video_path, start_time, end_time, target_fps
-        ):
-            if len(extracted_frames_paths) >= limit:
-                break
-            path = str(
-                Path(extract_path)
-                / (
-                    video_name
-                    + "_"
-                    + str(extracted_frame_no).zfill(zero_fill_count)
-                    + ".jpg"
-                )
-            )
-            extracted_frame_no += 1
-            cv2.imwrite(path, frame)
-            extracted_frames_paths.append(path)
-            if len(extracted_frames_paths) % chunk_size == 0:
-                yield extracted_frames_paths
-                extracted_frames_paths.clear()
+        # JPEG encoding releases the GIL, frames are written while the next ones decode
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=FRAME_WRITE_WORKERS
+        ) as executor:
+            futures = []
+            for frame in VideoPlugin.frames_generator(
+                video_path, start_time, end_time, target_fps
+            ):
+                if len(extracted_frames_paths) >= limit:
+                    break
+                path = f"{path_prefix}{str(extracted_frame_no).zfill(zero_fill_count)}.jpg"
+                extracted_frame_no += 1
+                futures.append(executor.submit(VideoPlugin.write_frame, path, frame))
+                if len(futures) > FRAME_WRITE_WORKERS * 2:
+                    # bounds the decoded frames held in memory
+                    futures.pop(0).result()
+                extracted_frames_paths.append(path)
+                if len(extracted_frames_paths) % chunk_size == 0:
+                    for future in futures:
+                        future.result()
+                    futures.clear()
+                    yield extracted_frames_paths
+                    extracted_frames_paths.clear()
+            for future in futures:
+                future.result()
         if extracted_frames_paths:
             yield extracted_frames_paths
@@ -195,7 +195,7 @@ class GetBulkImages(BaseUseCase):
             )
             if "error" in response:
                 raise AppException(response["error"])
-            res += [ImageEntity.from_dict(**image) for image in response]
+            res += ImageEntity.bulk_from_records(response)
         self._response.data = res
         return self._response
 
@@ -810,142 +810,137 @@ class CreateFuseImageUseCase(BaseUseCase):
         return self._annotation_mask_path
 
     def execute(self):
-        with open(self._image_path, "rb") as file:
-            class_color_map = {}
-            Image = namedtuple("Image", ["type", "path", "content"])
-            for annotation_class in self._classes:
-                class_color_map[annotation_class["name"]] = self.generate_color(
-                    annotation_class["color"]
+        class_color_map = {}
+        Image = namedtuple("Image", ["type", "path", "content"])
+        for annotation_class in self._classes:
+            class_color_map[annotation_class["name"]] = self.generate_color(
+                annotation_class["color"]
+            )
+        if self._project_type.upper() == constances.ProjectType.VECTOR.name.upper():
+            image = ImagePlugin(self._image_path)
+
+            images = [
+                Image("fuse", f"{self._image_path}___fuse.png", image.get_empty(),)
+            ]
+            if self._generate_overlay:
+                images.append(
+                    Image("overlay", f"{self._image_path}___overlay.png", image)
                 )
-            if self._project_type.upper() == constances.ProjectType.VECTOR.name.upper():
-                image = ImagePlugin(io.BytesIO(file.read()))
 
-                images = [
-                    Image("fuse", f"{self._image_path}___fuse.png", image.get_empty(),)
-                ]
-                if self._generate_overlay:
-                    images.append(
-                        Image("overlay", f"{self._image_path}___overlay.png", image)
+            outline_color = 4 * (255,)
+            for instance in self.annotations["instances"]:
+                if (not instance.get("className")) or (
+                    not class_color_map.get(instance["className"])
+                ):
+                    continue
+                color = class_color_map.get(instance["className"])
+                if not color:
+                    class_color_map[instance["className"]] = self.generate_color()
+                for image in images:
+                    fill_color = (
+                        *class_color_map[instance["className"]],
+                        255 if image.type == "fuse" else self.TRANSPARENCY,
                     )
-
-                outline_color = 4 * (255,)
-                for instance in self.annotations["instances"]:
-                    if (not instance.get("className")) or (
-                        not class_color_map.get(instance["className"])
-                    ):
-                        continue
-                    color = class_color_map.get(instance["className"])
-                    if not color:
-                        class_color_map[instance["className"]] = self.generate_color()
-                    for image in images:
-                        fill_color = (
-                            *class_color_map[instance["className"]],
-                            255 if image.type == "fuse" else self.TRANSPARENCY,
+                    if instance["type"] == "bbox":
+                        image.content.draw_bbox(
+                            **instance["points"],
+                            fill_color=fill_color,
+                            outline_color=outline_color,
                         )
-                        if instance["type"] == "bbox":
-                            image.content.draw_bbox(
-                                **instance["points"],
-                                fill_color=fill_color,
-                                outline_color=outline_color,
-                            )
-                        elif instance["type"] == "polygon":
-                            image.content.draw_polygon(
-                                instance["points"],
-                                fill_color=fill_color,
-                                outline_color=outline_color,
+                    elif instance["type"] == "polygon":
+                        image.content.draw_polygon(
+                            instance["points"],
+                            fill_color=fill_color,
+                            outline_color=outline_color,
+                        )
+                    elif instance["type"] == "ellipse":
+                        image.content.draw_ellipse(
+                            instance["cx"],
+                            instance["cy"],
+                            instance["rx"],
+                            instance["ry"],
+                            fill_color=fill_color,
+                            outline_color=outline_color,
+                        )
+                    elif instance["type"] == "polyline":
+                        image.content.draw_polyline(
+                            points=instance["points"], fill_color=fill_color
+                        )
+                    elif instance["type"] == "point":
+                        image.content.draw_point(
+                            x=instance["x"],
+                            y=instance["y"],
+                            fill_color=fill_color,
+                            outline_color=outline_color,
+                        )
+                    elif instance["type"] == "template":
+                        point_set = instance["points"]
+                        points_id_map = {}
+                        for points in point_set:
+                            points_id_map[points["id"]] = (points["x"], points["y"])
+                            points = (
+                                points["x"] - 2,
+                                points["y"] - 2,
+                                points["x"] + 2,
+                                points["y"] + 2,
                             )
-                        elif instance["type"] == "ellipse":
                             image.content.draw_ellipse(
-                                instance["cx"],
-                                instance["cy"],
-                                instance["rx"],
-                                instance["ry"],
-                                fill_color=fill_color,
-                                outline_color=outline_color,
-                            )
-                        elif instance["type"] == "polyline":
-                            image.content.draw_polyline(
-                                points=instance["points"], fill_color=fill_color
+                                *points, fill_color, fill_color, fixed=True
                             )
-                        elif instance["type"] == "point":
-                            image.content.draw_point(
-                                x=instance["x"],
-                                y=instance["y"],
+                        for connection in instance["connections"]:
+                            image.content.draw_line(
+                                points_id_map[connection["from"]],
+                                points_id_map[connection["to"]],
                                 fill_color=fill_color,
-                                outline_color=outline_color,
                             )
-                        elif instance["type"] == "template":
-                            point_set = instance["points"]
-                            points_id_map = {}
-                            for points in point_set:
-                                points_id_map[points["id"]] = (points["x"], points["y"])
-                                points = (
-                                    points["x"] - 2,
-                                    points["y"] - 2,
-                                    points["x"] + 2,
-                                    points["y"] + 2,
-                                )
-                                image.content.draw_ellipse(
-                                    *points, fill_color, fill_color, fixed=True
-                                )
-                            for connection in instance["connections"]:
-                                image.content.draw_line(
-                                    points_id_map[connection["from"]],
-                                    points_id_map[connection["to"]],
-                                    fill_color=fill_color,
-                                )
-            else:
-                if not os.path.exists(self.blue_mask_path):
-                    logger.warning(
-                        "There is no blue map to generate fuse or overlay images."
-                    )
-                    return self._response
-                image = ImagePlugin(io.BytesIO(file.read()))
-                annotation_mask = np.array(
-                    ImagePlugin(
-                        io.BytesIO(open(self.blue_mask_path, "rb").read())
-                    ).content
+        else:
+            if not os.path.exists(self.blue_mask_path):
+                logger.warning(
+                    "There is no blue map to generate fuse or overlay images."
                 )
-                weight, height = image.get_size()
-                empty_image_arr = np.full((height, weight, 4), [0, 0, 0, 255], np.uint8)
-                for annotation in self.annotations["instances"]:
-                    if (not annotation.get("className")) or (
-                        not class_color_map.get(annotation["className"])
-                    ):
-                        continue
-                    fill_color = *class_color_map[annotation["className"]], 255
-                    for part in annotation["parts"]:
-                        part_color = *self.generate_color(part["color"]), 255
-                        temp_mask = np.alltrue(annotation_mask == part_color, axis=2)
-                        empty_image_arr[temp_mask] = fill_color
-
-                images = [
-                    Image(
-                        "fuse",
-                        f"{self._image_path}___fuse.png",
-                        ImagePlugin.from_array(empty_image_arr),
-                    )
-                ]
+                return self._response
+            image = ImagePlugin(self._image_path)
+            annotation_mask = np.array(ImagePlugin(self.blue_mask_path).content)
+            weight, height = image.get_size()
+            empty_image_arr = np.full((height, weight, 4), [0, 0, 0, 255], np.uint8)
+            for annotation in self.annotations["instances"]:
+                if (not annotation.get("className")) or (
+                    not class_color_map.get(annotation["className"])
+                ):
+                    continue
+                fill_color = *class_color_map[annotation["className"]], 255
+                for part in annotation["parts"]:
+                    part_color = *self.generate_color(part["color"]), 255
+                    temp_mask = np.alltrue(annotation_mask == part_color, axis=2)
+                    empty_image_arr[temp_mask] = fill_color
+
+            images = [
+                Image(
+                    "fuse",
+                    f"{self._image_path}___fuse.png",
+                    ImagePlugin.from_array(empty_image_arr),
+                )
+            ]
 
-                if self._generate_overlay:
-                    alpha = 0.5  # transparency measure
-                    overlay = copy.copy(empty_image_arr)
-                    overlay[:, :, :3] = np.array(image.content)[:, :, :3]
-                    overlay = ImagePlugin.from_array(
-                        cv2.addWeighted(empty_image_arr, alpha, overlay, 1 - alpha, 0)
-                    )
-                    images.append(
-                        Image("overlay", f"{self._image_path}___overlay.png", overlay)
-                    )
+            if self._generate_overlay:
+                alpha = 0.5  # transparency measure
+                overlay = copy.copy(empty_image_arr)
+                overlay[:, :, :3] = np.array(image.content)[:, :, :3]
+                overlay = ImagePlugin.from_array(
+                    cv2.addWeighted(empty_image_arr, alpha, overlay, 1 - alpha, 0)
+                )
+                images.append(
+                    Image("overlay", f"{self._image_path}___overlay.png", overlay)
+                )
 
-            if not self._in_memory:
-                paths = []
-                for image in images:
-                    image.content.save(image.path)
-                    paths.append(image.path)
-                self._response.data = paths
-            else:
-                self._response.data = (image.content for image in images)
+        if not self._in_memory:
+            paths = []
+            for image in images:
+                image.content.save(image.path)
+                paths.append(image.path)
+            self._response.data = paths
+        else:
+            self._response.data = (image.content for image in images)
         return self._response
 
 
@@ -1536,15 +1531,26 @@ class UploadImagesFromFolderToProject(UploadImagesToProject):
             extensions = constances.DEFAULT_IMAGE_EXTENSIONS
         paths = []
         if from_s3_bucket is None:
+            # the folder is listed once and the names are matched against every
+            # extension, instead of a glob over the folder per extension and case
+            suffixes = []
             for extension in extensions:
-                if recursive_sub_folders:
-                    paths += list(Path(folder_path).rglob(f"*.{extension.lower()}"))
-                    if os.name != "nt":
-                        paths += list(Path(folder_path).rglob(f"*.{extension.upper()}"))
-                else:
-                    paths += list(Path(folder_path).glob(f"*.{extension.lower()}"))
-                    if os.name != "nt":
-                        paths += list(Path(folder_path).glob(f"*.{extension.upper()}"))
+                suffixes.append(f".{extension.lower()}")
+                if os.name != "nt":
+                    suffixes.append(f".{extension.upper()}")
+            suffix_paths = {suffix: [] for suffix in suffixes}
+            if recursive_sub_folders:
+                folder_paths = Path(folder_path).rglob("*")
+            else:
+                folder_paths = Path(folder_path).glob("*")
+            for path in folder_paths:
+                # glob matches names case insensitively on Windows
+                name = path.name if os.name != "nt" else path.name.lower()
+                for suffix, matched_paths in suffix_paths.items():
+                    if name.endswith(suffix):
+                        matched_paths.append(path)
+            for suffix in suffixes:
+                paths += suffix_paths[suffix]
 
         else:
             s3_client = boto3.client("s3")
@@ -1552,18 +1558,19 @@ class UploadImagesFromFolderToProject(UploadImagesToProject):
             response_iterator = paginator.paginate(
                 Bucket=from_s3_bucket, Prefix=folder_path
             )
+            s3_suffixes = tuple(
+                suffix
+                for extension in extensions
+                for suffix in (f".{extension.lower()}", f".{extension.upper()}")
+            )
             for response in response_iterator:
                 contents = response.get("Contents", [])
                 for object_data in contents:
                     key = object_data["Key"]
                     if not recursive_sub_folders and "/" in key[len(folder_path) + 1 :]:
                         continue
-                    for extension in extensions:
-                        if key.endswith(f".{extension.lower()}") or key.endswith(
-                            f".{extension.upper()}"
-                        ):
-                            paths.append(key)
-                            break
+                    if key.endswith(s3_suffixes):
+                        paths.append(key)
 
         return [str(path) for path in paths]
 
@@ -1796,8 +1803,9 @@ class UploadImageS3UseCase(BaseUseCase):
         try:
             image_processor = ImagePlugin(self._image, self.max_resolution)
             origin_width, origin_height = image_processor.get_size()
-            thumb_image, _, _ = image_processor.generate_thumb()
-            huge_image, huge_width, huge_height = image_processor.generate_huge()
+            generated_images = image_processor.generate_all()
+            thumb_image, _, _ = generated_images["thumb"]
+            huge_image, huge_width, huge_height = generated_images["huge"]
             quality = 60
             if not self._image_quality_in_editor:
                 for setting in self._project_settings:
@@ -1,9 +1,11 @@
 import concurrent.futures
+import copy
 import logging
 import os.path
 import tempfile
 import time
 import zipfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 from typing import List
@@ -15,7 +17,8 @@ import requests
 from botocore.exceptions import ClientError
 from lib.app.analytics.common import aggregate_image_annotations_as_df
 from lib.app.analytics.common import consensus_plot
-from lib.app.analytics.common import image_consensus
+from lib.app.analytics.common import flatten_meta_coordinates
+from lib.app.analytics.common import images_consensus
 from lib.core.conditions import Condition
 from lib.core.conditions import CONDITION_EQ as EQ
 from lib.core.entities import FolderEntity
@@ -164,16 +167,13 @@ class CreateModelUseCase(BaseUseCase):
         self._folders = folders
 
     @property
-    def hyper_parameters(self):
-        if self._hyper_parameters:
-            for parameter in constances.DEFAULT_HYPER_PARAMETERS:
-                if parameter not in self._hyper_parameters:
-                    self._hyper_parameters[
-                        parameter
-                    ] = constances.DEFAULT_HYPER_PARAMETERS[parameter]
-        else:
-            self._hyper_parameters = constances.DEFAULT_HYPER_PARAMETERS
-        return self._hyper_parameters
+    def hyper_parameters(self) -> dict:
+        # a new dict each time, neither the shared defaults (nested lists
+        # included) nor the caller's dict are handed out or modified
+        return {
+            **copy.deepcopy(dict(constances.DEFAULT_HYPER_PARAMETERS)),
+            **(self._hyper_parameters or {}),
+        }
 
     @staticmethod
     def split_path(path: str):
@@ -181,65 +181,77 @@ class CreateModelUseCase(BaseUseCase):
             return path.split("/")
         return path, "root"
 
-    def execute(self):
-        train_folder_ids = []
-        test_folder_ids = []
-        projects = []
-
-        for path in self._train_data_paths:
-            project_name, folder_name = self.split_path(path)
-            projects = self._projects.get_all(
-                Condition("name", project_name, EQ)
-                & Condition("team_id", self._team_id, EQ)
-            )
-
-            projects.extend(projects)
-            folders = self._folders.get_all(
-                Condition("name", folder_name, EQ)
-                & Condition("team_id", self._team_id, EQ)
-                & Condition("project_id", projects[0].uuid, EQ)
-            )
-            train_folder_ids.append(folders[0].uuid)
-
-        for path in self._test_data_paths:
-            project_name, folder_name = self.split_path(path)
-            projects.extend(
-                self._projects.get_all(
+    def _get_projects(self, paths: List[tuple]) -> dict:
+        projects = {}
+        for project_name, _ in paths:
+            if project_name not in projects:
+                projects[project_name] = self._projects.get_all(
                     Condition("name", project_name, EQ)
                     & Condition("team_id", self._team_id, EQ)
-                )
-            )
-            folders = self._folders.get_all(
-                Condition("name", folder_name, EQ)
-                & Condition("team_id", self._team_id, EQ)
-                & Condition("project_id", projects[0].uuid, EQ)
-            )
-            test_folder_ids.append(folders[0].uuid)
-
-        project_types = [project.project_type for project in projects]
+                )[0]
+        return projects
+
+    def _get_folder_ids(self, paths: List[tuple], projects: dict) -> dict:
+        folder_names = {}
+        for project_name, folder_name in paths:
+            folder_names.setdefault(project_name, {})[folder_name] = None
+
+        folder_ids = {}
+        for project_name, names in folder_names.items():
+            project_condition = Condition("team_id", self._team_id, EQ) & Condition(
+                "project_id", projects[project_name].uuid, EQ
+            )
+            # one listing of the project folders replaces a query per folder
+            project_folders = {}
+            if len(names) > 1:
+                project_folders = {
+                    folder.name: folder.uuid
+                    for folder in self._folders.get_all(project_condition)
+                }
+            for folder_name in names:
+                if folder_name not in project_folders:
+                    project_folders[folder_name] = self._folders.get_all(
+                        Condition("name", folder_name, EQ) & project_condition
+                    )[0].uuid
+                folder_ids[project_name, folder_name] = project_folders[folder_name]
+        return folder_ids
 
-        if set(train_folder_ids) & set(test_folder_ids):
-            self._response.errors = AppException(
-                "Avoid overlapping between training and test data."
-            )
+    def execute(self):
+        train_paths = [tuple(self.split_path(path)) for path in self._train_data_paths]
+        test_paths = [tuple(self.split_path(path)) for path in self._test_data_paths]
+        # the checks run as soon as their data is known, invalid input fails
+        # before the folders are looked up
+        overlapping_data_error = AppException(
+            "Avoid overlapping between training and test data."
+        )
+        if set(train_paths) & set(test_paths):
+            self._response.errors = overlapping_data_error
             return
+
+        projects = self._get_projects(train_paths + test_paths)
+        project_types = [project.project_type for project in projects.values()]
         if len(set(project_types)) != 1:
             self._response.errors = AppException(
                 "All projects have to be of the same type. Either vector or pixel"
             )
             return
         if any(
-            {
-                True
-                for project in projects
-                if project.upload_state == constances.UploadState.EXTERNAL.value
-            }
+            project.upload_state == constances.UploadState.EXTERNAL.value
+            for project in projects.values()
         ):
             self._response.errors = AppException(
                 "The function does not support projects containing images attached with URLs"
             )
             return
 
+        folder_ids = self._get_folder_ids(train_paths + test_paths, projects)
+        train_folder_ids = [folder_ids[path] for path in train_paths]
+        test_folder_ids = [folder_ids[path] for path in test_paths]
+        if set(train_folder_ids) & set(test_folder_ids):
+            self._response.errors = overlapping_data_error
+            return
+        projects = list(projects.values())
+
         base_model = self._ml_models.get_all(
             Condition("name", self._base_model_name, EQ)
             & Condition("team_id", self._team_id, EQ)
@@ -258,12 +270,11 @@ class CreateModelUseCase(BaseUseCase):
         completed_images_data = self._backend_service.bulk_get_folders(
             self._team_id, [project.uuid for project in projects]
         )
+        train_folder_ids_set = set(train_folder_ids)
         complete_image_count = sum(
-            [
-                folder["completedCount"]
-                for folder in completed_images_data["data"]
-                if folder["id"] in train_folder_ids
-            ]
+            folder["completedCount"]
+            for folder in completed_images_data["data"]
+            if folder["id"] in train_folder_ids_set
         )
         ml_model = MLModelEntity(
             name=self._model_name,
@@ -350,6 +361,10 @@ class StopModelTraining(BaseUseCase):
 
 
 class DownloadExportUseCase(BaseInteractiveUseCase):
+    MAX_WORKERS = 10
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    EXTRACT_IN_MEMORY_MAX_SIZE = 64 * 1024 * 1024
+
     def __init__(
         self,
         service: SuerannotateServiceProvider,
@@ -367,21 +382,39 @@ class DownloadExportUseCase(BaseInteractiveUseCase):
         self._extract_zip_contents = extract_zip_contents
         self._to_s3_bucket = to_s3_bucket
         self._temp_dir = None
+        self._files_to_upload = None
+
+    @staticmethod
+    def _get_files(folder_path: str) -> List[str]:
+        return [
+            os.path.join(root, file_name)
+            for root, _, file_names in os.walk(folder_path)
+            for file_name in file_names
+        ]
 
-    def upload_to_s3_from_folder(self, folder_path: str):
-        to_s3_bucket = boto3.Session().resource("s3").Bucket(self._to_s3_bucket)
-        files_to_upload = list(Path(folder_path).rglob("*.*"))
+    def upload_to_s3(self, files_to_upload: List[str]):
+        s3_client = boto3.Session().client("s3")
 
-        def _upload_file_to_s3(_to_s3_bucket, _path, _s3_key) -> None:
-            _to_s3_bucket.upload_file(_path, _s3_key)
+        def _upload_file_to_s3(_path) -> None:
+            s3_key = f"{self._folder_path}/{os.path.basename(_path)}"
+            s3_client.upload_file(_path, self._to_s3_bucket, s3_key)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            results = []
+        # at most MAX_WORKERS uploads are in flight, each yield is a finished one
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS
+        ) as executor:
+            pending = set()
             for path in files_to_upload:
-                s3_key = f"{self._folder_path}/{path.name}"
-                results.append(
-                    executor.submit(_upload_file_to_s3, to_s3_bucket, str(path), s3_key)
-                )
+                if len(pending) == self.MAX_WORKERS:
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        future.result()
+                        yield
+                pending.add(executor.submit(_upload_file_to_s3, path))
+            for future in concurrent.futures.as_completed(pending):
+                future.result()
                 yield
 
     def download_to_local_storage(self, destination: str):
@@ -389,6 +422,8 @@ class DownloadExportUseCase(BaseInteractiveUseCase):
             team_id=self._project.team_id, project_id=self._project.uuid
         )
         export = next(filter(lambda i: i["name"] == self._export_name, exports), None)
+        if not export:
+            raise AppException("Export not found.")
         export = self._service.get_export(
             team_id=self._project.team_id,
             project_id=self._project.uuid,
@@ -398,9 +433,15 @@ class DownloadExportUseCase(BaseInteractiveUseCase):
             raise AppException("Export not found.")
         export_status = export["status"]
 
+        # poll with an exponential backoff, short exports are picked up quickly
+        # and long ones don't flood the server with requests
+        wait_seconds = 1
         while export_status != ExportStatus.COMPLETE.value:
-            logger.info("Waiting 5 seconds for export to finish on server.")
-            time.sleep(5)
+            logger.info(
+                f"Waiting {wait_seconds} seconds for export to finish on server."
+            )
+            time.sleep(wait_seconds)
+            wait_seconds = min(wait_seconds * 2, 30)
 
             export = self._service.get_export(
                 team_id=self._project.team_id,
@@ -417,27 +458,39 @@ class DownloadExportUseCase(BaseInteractiveUseCase):
         filepath = Path(destination) / filename
         with requests.get(export["download"], stream=True) as response:
             response.raise_for_status()
-            with open(filepath, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-        if self._extract_zip_contents:
-            with zipfile.ZipFile(filepath, "r") as f:
-                f.extractall(destination)
-            Path.unlink(filepath)
+            if self._extract_zip_contents:
+                # the archive is only needed for extraction, small ones are kept
+                # in memory instead of being written to the destination first
+                with tempfile.SpooledTemporaryFile(
+                    max_size=self.EXTRACT_IN_MEMORY_MAX_SIZE
+                ) as f:
+                    self._write_response(response, f)
+                    f.seek(0)
+                    with zipfile.ZipFile(f, "r") as archive:
+                        archive.extractall(destination)
+            else:
+                with open(filepath, "wb") as f:
+                    self._write_response(response, f)
         return export["id"], filepath, destination
 
+    def _write_response(self, response: requests.Response, file):
+        for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+            file.write(chunk)
+
     def get_upload_files_count(self):
         if not self._temp_dir:
             self._temp_dir = tempfile.TemporaryDirectory()
             self.download_to_local_storage(self._temp_dir.name)
-        return len(list(Path(self._temp_dir.name).rglob("*.*")))
+            # the downloaded files are listed once for the count and the upload
+            self._files_to_upload = self._get_files(self._temp_dir.name)
+        return len(self._files_to_upload)
 
     def execute(self):
         if self.is_valid():
             report = []
             if self._to_s3_bucket:
                 self.get_upload_files_count()
-                yield from self.upload_to_s3_from_folder(self._temp_dir.name)
+                yield from self.upload_to_s3(self._files_to_upload)
                 report.append(
                     f"Exported to AWS {self._to_s3_bucket}/{self._folder_path}"
                 )
@@ -497,24 +550,31 @@ class DownloadMLModelUseCase(BaseUseCase):
                 aws_session_token=auth_response.data.session_token,
                 region_name=auth_response.data.region,
             )
-            bucket = s3_session.resource("s3").Bucket(auth_response.data.bucket)
-
-            bucket.download_file(
-                self._model.config_path,
-                os.path.join(self._download_path, "config.yaml"),
-            )
-            bucket.download_file(
-                self._model.path,
-                os.path.join(self._download_path, os.path.basename(self._model.path)),
-            )
+            # boto3 clients, unlike resources, are safe to share between threads
+            s3_client = s3_session.client("s3")
+            downloads = (
+                (self._model.config_path, "config.yaml"),
+                (self._model.path, os.path.basename(self._model.path)),
+                (metrics_path, metrics_name),
+                (mapper_path, "classes_mapper.json"),
+            )
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(downloads)
+            ) as executor:
+                config_future, model_future, *optional_futures = [
+                    executor.submit(
+                        s3_client.download_file,
+                        auth_response.data.bucket,
+                        key,
+                        os.path.join(self._download_path, file_name),
+                    )
+                    for key, file_name in downloads
+                ]
+            config_future.result()
+            model_future.result()
             try:
-                bucket.download_file(
-                    metrics_path, os.path.join(self._download_path, metrics_name)
-                )
-                bucket.download_file(
-                    mapper_path,
-                    os.path.join(self._download_path, "classes_mapper.json"),
-                )
+                for future in optional_futures:
+                    future.result()
             except ClientError:
                 logger.info(
                     "The specified model does not contain a classes_mapper and/or a metrics file."
@@ -523,6 +583,68 @@ class DownloadMLModelUseCase(BaseUseCase):
         return self._response
 
 
+@lru_cache(maxsize=2)
+def _aggregate_export(export_dir: str, files_signature: tuple) -> pd.DataFrame:
+    return aggregate_image_annotations_as_df(export_dir)
+
+
+def _get_export_annotations_df(export_dir) -> pd.DataFrame:
+    # the parsed export is reused until one of its json files is added, removed or
+    # modified, so reruns on the same export skip parsing it again
+    files_signature = []
+    for root, _, file_names in os.walk(export_dir):
+        for file_name in file_names:
+            if file_name.endswith(".json"):
+                path = os.path.join(root, file_name)
+                stat = os.stat(path)
+                files_signature.append((path, stat.st_mtime_ns, stat.st_size))
+    files_signature.sort()
+    return _aggregate_export(str(export_dir), tuple(files_signature)).copy()
+
+
+_INSTANCE_KEY_COLUMNS = ["imageName", "instanceId", "folderName"]
+_CONSENSUS_COLUMNS = [
+    *_INSTANCE_KEY_COLUMNS,
+    "className",
+    "creatorEmail",
+    "meta",
+    "attributeGroupName",
+    "attributeName",
+]
+
+
+def _aggregate_attributes(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns the first row of every instance, with the attributes of the
+    instance collected into an "attributes" dict of the attribute group names
+    to the lists of their attribute names, or None if it has no attributes.
+    """
+    df = df[_CONSENSUS_COLUMNS].dropna(subset=_INSTANCE_KEY_COLUMNS)
+    # the attribute names are listed by a single groupby for all the instances,
+    # instead of a Python callback on the rows of every instance
+    attribute_names = (
+        df[df["attributeGroupName"].notna()]
+        .groupby([*_INSTANCE_KEY_COLUMNS, "attributeGroupName"])["attributeName"]
+        .agg(list)
+    )
+    instances_attributes = {}
+    for (*instance_key, group_name), names in attribute_names.items():
+        instances_attributes.setdefault(tuple(instance_key), {})[group_name] = names
+
+    instances_df = (
+        df.drop(columns=["attributeGroupName", "attributeName"])
+        .drop_duplicates(subset=_INSTANCE_KEY_COLUMNS)
+        .sort_values(_INSTANCE_KEY_COLUMNS)
+        .reset_index(drop=True)
+    )
+    instances_df["attributes"] = [
+        instances_attributes.get(instance_key)
+        for instance_key in zip(
+            *(instances_df[column] for column in _INSTANCE_KEY_COLUMNS)
+        )
+    ]
+    return instances_df
+
+
 class BenchmarkUseCase(BaseUseCase):
     def __init__(
         self,
@@ -544,67 +666,32 @@ class BenchmarkUseCase(BaseUseCase):
         self._show_plots = show_plots
 
     def execute(self):
-        project_df = aggregate_image_annotations_as_df(self._export_dir)
-        gt_project_df = project_df[
-            project_df["folderName"] == self._ground_truth_folder_name
-        ]
+        project_df = _get_export_annotations_df(self._export_dir)
+        # the filters shared by all the folders are combined in a single mask
+        instances_mask = project_df["instanceId"].notna() & (
+            project_df["type"] == self._annotation_type
+        )
+        if self._image_list is not None:
+            instances_mask &= project_df["imageName"].isin(self._image_list)
+        # the instances of all the folders and of the ground truth are aggregated
+        # once, every folder then takes its rows and the ground truth ones
+        folder_names = [*self._folder_names, self._ground_truth_folder_name]
+        all_projects_df = _aggregate_attributes(
+            project_df[instances_mask & project_df["folderName"].isin(folder_names)]
+        )
+        all_projects_df = flatten_meta_coordinates(
+            all_projects_df, self._annotation_type
+        )
         benchmark_dfs = []
         for folder_name in self._folder_names:
-            folder_df = project_df[project_df["folderName"] == folder_name]
-            project_gt_df = pd.concat([folder_df, gt_project_df])
-            project_gt_df = project_gt_df[project_gt_df["instanceId"].notna()]
-
-            if self._image_list is not None:
-                project_gt_df = project_gt_df.loc[
-                    project_gt_df["imageName"].isin(self._image_list)
-                ]
-
-            project_gt_df.query("type == '" + self._annotation_type + "'", inplace=True)
-
-            project_gt_df = project_gt_df.groupby(
-                ["imageName", "instanceId", "folderName"]
-            )
-
-            def aggregate_attributes(instance_df):
-                def attribute_to_list(attribute_df):
-                    attribute_names = list(attribute_df["attributeName"])
-                    attribute_df["attributeNames"] = len(attribute_df) * [
-                        attribute_names
-                    ]
-                    return attribute_df
-
-                attributes = None
-                if not instance_df["attributeGroupName"].isna().all():
-                    attrib_group_name = instance_df.groupby("attributeGroupName")[
-                        ["attributeGroupName", "attributeName"]
-                    ].apply(attribute_to_list)
-                    attributes = dict(
-                        zip(
-                            attrib_group_name["attributeGroupName"],
-                            attrib_group_name["attributeNames"],
-                        )
-                    )
-
-                instance_df.drop(
-                    ["attributeGroupName", "attributeName"], axis=1, inplace=True
-                )
-                instance_df.drop_duplicates(
-                    subset=["imageName", "instanceId", "folderName"], inplace=True
+            project_gt_df = all_projects_df[
+                all_projects_df["folderName"].isin(
+                    [folder_name, self._ground_truth_folder_name]
                 )
-                instance_df["attributes"] = [attributes]
-                return instance_df
-
-            project_gt_df = project_gt_df.apply(aggregate_attributes).reset_index(
-                drop=True
+            ].reset_index(drop=True)
+            benchmark_project_df = images_consensus(
+                project_gt_df, self._annotation_type
             )
-            unique_images = set(project_gt_df["imageName"])
-            all_benchmark_data = []
-            for image_name in unique_images:
-                image_data = image_consensus(
-                    project_gt_df, image_name, self._annotation_type
-                )
-                all_benchmark_data.append(pd.DataFrame(image_data))
-            benchmark_project_df = pd.concat(all_benchmark_data, ignore_index=True)
             benchmark_project_df = benchmark_project_df[
                 benchmark_project_df["folderName"] == folder_name
             ]
@@ -635,61 +722,19 @@ class ConsensusUseCase(BaseUseCase):
         self._show_plots = show_plots
 
     def execute(self):
-        project_df = aggregate_image_annotations_as_df(self._export_dir)
-        all_projects_df = project_df[project_df["instanceId"].notna()]
-        all_projects_df = all_projects_df.loc[
-            all_projects_df["folderName"].isin(self._folder_names)
-        ]
-
-        if self._image_list is not None:
-            all_projects_df = all_projects_df.loc[
-                all_projects_df["imageName"].isin(self._image_list)
-            ]
-
-        all_projects_df.query("type == '" + self._annota_type_type + "'", inplace=True)
-
-        def aggregate_attributes(instance_df):
-            def attribute_to_list(attribute_df):
-                attribute_names = list(attribute_df["attributeName"])
-                attribute_df["attributeNames"] = len(attribute_df) * [attribute_names]
-                return attribute_df
-
-            attributes = None
-            if not instance_df["attributeGroupName"].isna().all():
-                attrib_group_name = instance_df.groupby("attributeGroupName")[
-                    ["attributeGroupName", "attributeName"]
-                ].apply(attribute_to_list)
-                attributes = dict(
-                    zip(
-                        attrib_group_name["attributeGroupName"],
-                        attrib_group_name["attributeNames"],
-                    )
-                )
-
-            instance_df.drop(
-                ["attributeGroupName", "attributeName"], axis=1, inplace=True
-            )
-            instance_df.drop_duplicates(
-                subset=["imageName", "instanceId", "folderName"], inplace=True
-            )
-            instance_df["attributes"] = [attributes]
-            return instance_df
-
-        all_projects_df = all_projects_df.groupby(
-            ["imageName", "instanceId", "folderName"]
+        project_df = _get_export_annotations_df(self._export_dir)
+        instances_mask = (
+            project_df["instanceId"].notna()
+            & project_df["folderName"].isin(self._folder_names)
+            & (project_df["type"] == self._annota_type_type)
         )
-        all_projects_df = all_projects_df.apply(aggregate_attributes).reset_index(
-            drop=True
+        if self._image_list is not None:
+            instances_mask &= project_df["imageName"].isin(self._image_list)
+        all_projects_df = _aggregate_attributes(project_df[instances_mask])
+        all_projects_df = flatten_meta_coordinates(
+            all_projects_df, self._annota_type_type
         )
-        unique_images = set(all_projects_df["imageName"])
-        all_consensus_data = []
-        for image_name in unique_images:
-            image_data = image_consensus(
-                all_projects_df, image_name, self._annota_type_type
-            )
-            all_consensus_data.append(pd.DataFrame(image_data))
-
-        consensus_df = pd.concat(all_consensus_data, ignore_index=True)
+        consensus_df = images_consensus(all_projects_df, self._annota_type_type)
 
         if self._show_plots:
             consensus_plot(consensus_df, self._folder_names)
@@ -767,35 +812,41 @@ class RunSegmentationUseCase(BaseUseCase):
 
             success_images = []
             failed_images = []
-            while len(success_images) + len(failed_images) != len(image_ids):
+            # only the images still being segmented are polled, with an
+            # exponential backoff between the polls
+            pending_images = image_names
+            wait_seconds = 1
+            while pending_images:
                 images_metadata = (
                     GetBulkImages(
                         service=self._service,
                         project_id=self._project.uuid,
                         team_id=self._project.team_id,
                         folder_id=self._folder.uuid,
-                        images=self._images_list,
+                        images=pending_images,
                     )
                     .execute()
                     .data
                 )
-
-                success_images = [
-                    img.name
-                    for img in images_metadata
-                    if img.segmentation_status
-                    == constances.SegmentationStatus.COMPLETED.value
-                ]
-                failed_images = [
-                    img.name
-                    for img in images_metadata
-                    if img.segmentation_status
-                    == constances.SegmentationStatus.FAILED.value
-                ]
+                statuses = {
+                    image.name: image.segmentation_status for image in images_metadata
+                }
+                still_pending_images = []
+                for image_name in pending_images:
+                    status = statuses.get(image_name)
+                    if status == constances.SegmentationStatus.COMPLETED.value:
+                        success_images.append(image_name)
+                    elif status == constances.SegmentationStatus.FAILED.value:
+                        failed_images.append(image_name)
+                    else:
+                        still_pending_images.append(image_name)
+                pending_images = still_pending_images
                 logger.info(
                     f"segmentation complete on {len(success_images + failed_images)} / {len(image_ids)} images"
                 )
-                time.sleep(5)
+                if pending_images:
+                    time.sleep(wait_seconds)
+                    wait_seconds = min(wait_seconds * 2, 30)
 
             self._response.data = (success_images, failed_images)
         return self._response
@@ -827,6 +878,26 @@ class RunPredictionUseCase(BaseUseCase):
 
     def execute(self):
         if self.is_valid():
+            ml_models = self._ml_model_repo.get_all(
+                condition=Condition("name", self._ml_model_name, EQ)
+                & Condition("include_global", True, EQ)
+                & Condition("team_id", self._project.team_id, EQ)
+            )
+            # the name condition is a search, the last exact match is the model
+            ml_model = next(
+                (
+                    model
+                    for model in reversed(ml_models)
+                    if model.name == self._ml_model_name
+                ),
+                None,
+            )
+            # the model is resolved before the images are fetched, a missing one
+            # fails without the bulk images request
+            if not ml_model:
+                self._response.errors = AppException("Model not found.")
+                return self._response
+
             images = (
                 GetBulkImages(
                     service=self._service,
@@ -848,16 +919,6 @@ class RunPredictionUseCase(BaseUseCase):
                 )
                 return self._response
 
-            ml_models = self._ml_model_repo.get_all(
-                condition=Condition("name", self._ml_model_name, EQ)
-                & Condition("include_global", True, EQ)
-                & Condition("team_id", self._project.team_id, EQ)
-            )
-            ml_model = None
-            for model in ml_models:
-                if model.name == self._ml_model_name:
-                    ml_model = model
-
             res = self._service.run_prediction(
                 team_id=self._project.team_id,
                 project_id=self._project.uuid,
@@ -869,37 +930,42 @@ class RunPredictionUseCase(BaseUseCase):
 
             success_images = []
             failed_images = []
-            while len(success_images) + len(failed_images) != len(image_ids):
+            # there is no completion signal from the server, only the images
+            # still being predicted are polled, with an exponential backoff
+            # between the polls
+            pending_images = image_names
+            wait_seconds = 1
+            while pending_images:
                 images_metadata = (
                     GetBulkImages(
                         service=self._service,
                         project_id=self._project.uuid,
                         team_id=self._project.team_id,
                         folder_id=self._folder.uuid,
-                        images=self._images_list,
+                        images=pending_images,
                     )
                     .execute()
                     .data
                 )
-
-                success_images = [
-                    img.name
-                    for img in images_metadata
-                    if img.prediction_status
-                    == constances.SegmentationStatus.COMPLETED.value
-                ]
-                failed_images = [
-                    img.name
-                    for img in images_metadata
-                    if img.prediction_status
-                    == constances.SegmentationStatus.FAILED.value
-                ]
-
-                complete_images = success_images + failed_images
+                statuses = {
+                    image.name: image.prediction_status for image in images_metadata
+                }
+                still_pending_images = []
+                for image_name in pending_images:
+                    status = statuses.get(image_name)
+                    if status == constances.SegmentationStatus.COMPLETED.value:
+                        success_images.append(image_name)
+                    elif status == constances.SegmentationStatus.FAILED.value:
+                        failed_images.append(image_name)
+                    else:
+                        still_pending_images.append(image_name)
+                pending_images = still_pending_images
                 logger.info(
-                    f"prediction complete on {len(complete_images)} / {len(image_ids)} images"
+                    f"prediction complete on {len(success_images + failed_images)} / {len(image_ids)} images"
                 )
-                time.sleep(5)
+                if pending_images:
+                    time.sleep(wait_seconds)
+                    wait_seconds = min(wait_seconds * 2, 30)
 
             self._response.data = (success_images, failed_images)
         return self._response
@@ -75,7 +75,7 @@ class BaseController(metaclass=SingleInstanceMetaClass):
         if not config_path:
             config_path = constances.CONFIG_FILE_LOCATION
         config_path = Path(expanduser(config_path))
-        if str(config_path) == constances.CONFIG_FILE_LOCATION:
+        if config_path == constances.CONFIG_FILE_PATH:
             if not Path(self._config_path).is_file():
                 self.configs.insert(
                     ConfigEntity("main_endpoint", constances.BACKEND_URL)
@@ -293,10 +293,10 @@ class Controller(BaseController):
         name: str,
         description: str,
         project_type: str,
-        contributors: Iterable = tuple(),
-        settings: Iterable = tuple(),
-        annotation_classes: Iterable = tuple(),
-        workflows: Iterable = tuple(),
+        contributors: Iterable = (),
+        settings: Iterable = (),
+        annotation_classes: Iterable = (),
+        workflows: Iterable = (),
     ) -> Response:
 
         try:
@@ -1,11 +1,15 @@
 import io
 import json
 import os
+from operator import itemgetter
 from os.path import expanduser
+from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 import lib.core as constance
+from boto3.s3.transfer import TransferConfig
 from lib.core.conditions import Condition
 from lib.core.conditions import CONDITION_EQ as EQ
 from lib.core.entities import AnnotationClassEntity
@@ -26,6 +30,66 @@ from lib.core.repositories import BaseReadOnlyRepository
 from lib.core.repositories import BaseS3Repository
 from lib.infrastructure.services import SuperannotateBackendService
 
+_CONFIG_CACHE: Dict[str, Tuple[float, dict]] = {}
+
+_S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+)
+
+_PROJECT_GETTER = itemgetter(
+    "id",
+    "team_id",
+    "name",
+    "type",
+    "status",
+    "attachment_name",
+    "attachment_path",
+    "entropy_status",
+    "creator_id",
+    "upload_state",
+    "description",
+    "createdAt",
+    "updatedAt",
+)
+_FOLDER_GETTER = itemgetter("id", "team_id", "project_id", "name")
+_ANNOTATION_CLASS_GETTER = itemgetter(
+    "id",
+    "project_id",
+    "name",
+    "count",
+    "color",
+    "createdAt",
+    "updatedAt",
+    "attribute_groups",
+)
+_IMAGE_GETTER = itemgetter(
+    "id",
+    "name",
+    "path",
+    "project_id",
+    "team_id",
+    "annotation_status",
+    "folder_id",
+    "annotator_id",
+    "annotator_name",
+)
+_ML_MODEL_GETTER = itemgetter(
+    "id",
+    "name",
+    "description",
+    "base_model_id",
+    "type",
+    "task",
+    "image_count",
+    "path",
+    "config_path",
+    "is_global",
+    "training_status",
+)
+
 
 class ConfigRepository(BaseManageableRepository):
     def __init__(self, config_path: str = constance.CONFIG_FILE_LOCATION):
@@ -46,8 +110,14 @@ class ConfigRepository(BaseManageableRepository):
     def _get_config(self) -> Optional[dict]:
         if not os.path.exists(self.config_path):
             return
+        mtime = os.path.getmtime(self.config_path)
+        cached = _CONFIG_CACHE.get(self.config_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
         with open(self.config_path) as config:
-            return json.load(config)
+            data = json.load(config)
+        _CONFIG_CACHE[self.config_path] = (mtime, data)
+        return data
 
     def get_one(self, uuid: str) -> Optional[ConfigEntity]:
         config = self._get_config()
@@ -67,19 +137,21 @@ class ConfigRepository(BaseManageableRepository):
         config = self._get_config()
         if not config:
             config = self._create_config()
-        config[entity.uuid] = entity.value
+        config = {**config, entity.uuid: entity.value}
         with open(self._config_path, "w") as config_file:
             config_file.write(json.dumps(config, sort_keys=True, indent=4))
+        _CONFIG_CACHE.pop(self.config_path, None)
         return entity
 
     def update(self, entity: ConfigEntity):
         self.insert(entity)
 
     def delete(self, uuid: str):
-        config = self._get_config()
-        del config["uuid"]
-        with open(constance.CONFIG_FILE_LOCATION, "rw+") as config_file:
+        config = dict(self._get_config())
+        del config[uuid]
+        with open(self.config_path, "w") as config_file:
             config_file.write(json.dumps(config, sort_keys=True, indent=4))
+        _CONFIG_CACHE.pop(self.config_path, None)
 
 
 class ProjectRepository(BaseManageableRepository):
@@ -119,27 +191,42 @@ class ProjectRepository(BaseManageableRepository):
     @staticmethod
     def dict2entity(data: dict):
         try:
+            (
+                uuid,
+                team_id,
+                name,
+                project_type,
+                status,
+                attachment_name,
+                attachment_path,
+                entropy_status,
+                creator_id,
+                upload_state,
+                description,
+                created_at,
+                updated_at,
+            ) = _PROJECT_GETTER(data)
             return ProjectEntity(
-                uuid=data["id"],
-                team_id=data["team_id"],
-                name=data["name"],
-                project_type=data["type"],
-                status=data["status"],
-                attachment_name=data["attachment_name"],
-                attachment_path=data["attachment_path"],
-                entropy_status=data["entropy_status"],
+                uuid=uuid,
+                team_id=team_id,
+                name=name,
+                project_type=project_type,
+                status=status,
+                attachment_name=attachment_name,
+                attachment_path=attachment_path,
+                entropy_status=entropy_status,
                 sharing_status=data.get("sharing_status"),
-                creator_id=data["creator_id"],
-                upload_state=data["upload_state"],
-                description=data["description"],
+                creator_id=creator_id,
+                upload_state=upload_state,
+                description=description,
                 folder_id=data.get("folder_id"),
                 users=data.get("users", ()),
                 completed_images_count=data.get("completedImagesCount"),
                 root_folder_completed_images_count=data.get(
                     "rootFolderCompletedImagesCount"
                 ),
-                createdAt=data["createdAt"],
-                updatedAt=data["updatedAt"],
+                createdAt=created_at,
+                updatedAt=updated_at,
             )
         except KeyError:
             raise AppException("Cant serialize project data")
@@ -148,17 +235,28 @@ class ProjectRepository(BaseManageableRepository):
 class S3Repository(BaseS3Repository):
     def get_one(self, uuid: str) -> S3FileEntity:
         file = io.BytesIO()
-        self._resource.Object(self._bucket, uuid).download_fileobj(file)
+        self._resource.Object(self._bucket, uuid).download_fileobj(
+            file, Config=_S3_TRANSFER_CONFIG
+        )
         return S3FileEntity(uuid=uuid, data=file)
 
     def insert(self, entity: S3FileEntity) -> S3FileEntity:
-        data = {"Key": entity.uuid, "Body": entity.data}
+        extra_args = {}
         if entity.metadata:
             temp = entity.metadata
             for k in temp:
                 temp[k] = str(temp[k])
-            data["Metadata"] = temp
-        self.bucket.put_object(**data)
+            extra_args["Metadata"] = temp
+        if hasattr(entity.data, "read"):
+            # managed transfer switches to concurrent multipart upload for large files
+            self.bucket.upload_fileobj(
+                entity.data,
+                entity.uuid,
+                ExtraArgs=extra_args,
+                Config=_S3_TRANSFER_CONFIG,
+            )
+        else:
+            self.bucket.put_object(Key=entity.uuid, Body=entity.data, **extra_args)
         return entity
 
     def update(self, entity: ProjectEntity):
@@ -292,11 +390,12 @@ class FolderRepository(BaseManageableRepository):
     @staticmethod
     def dict2entity(data: dict):
         try:
+            uuid, team_id, project_id, name = _FOLDER_GETTER(data)
             return FolderEntity(
-                uuid=data["id"],
-                team_id=data["team_id"],
-                project_id=data["project_id"],
-                name=data["name"],
+                uuid=uuid,
+                team_id=team_id,
+                project_id=project_id,
+                name=name,
                 folder_users=data.get("folder_users"),
             )
         except KeyError:
@@ -342,15 +441,25 @@ class AnnotationClassRepository(BaseManageableRepository):
 
     @staticmethod
     def dict2entity(data: dict):
+        (
+            uuid,
+            project_id,
+            name,
+            count,
+            color,
+            created_at,
+            updated_at,
+            attribute_groups,
+        ) = _ANNOTATION_CLASS_GETTER(data)
         return AnnotationClassEntity(
-            uuid=data["id"],
-            project_id=data["project_id"],
-            name=data["name"],
-            count=data["count"],
-            color=data["color"],
-            createdAt=data["createdAt"],
-            updatedAt=data["updatedAt"],
-            attribute_groups=data["attribute_groups"],
+            uuid=uuid,
+            project_id=project_id,
+            name=name,
+            count=count,
+            color=color,
+            createdAt=created_at,
+            updatedAt=updated_at,
+            attribute_groups=attribute_groups,
         )
 
 
@@ -384,16 +493,27 @@ class ImageRepository(BaseManageableRepository):
 
     @staticmethod
     def dict2entity(data: dict):
+        (
+            uuid,
+            name,
+            path,
+            project_id,
+            team_id,
+            annotation_status,
+            folder_id,
+            annotator_id,
+            annotator_name,
+        ) = _IMAGE_GETTER(data)
         return ImageEntity(
-            uuid=data["id"],
-            name=data["name"],
-            path=data["path"],
-            project_id=data["project_id"],
-            team_id=data["team_id"],
-            annotation_status_code=data["annotation_status"],
-            folder_id=data["folder_id"],
-            annotator_id=data["annotator_id"],
-            annotator_name=data["annotator_name"],
+            uuid=uuid,
+            name=name,
+            path=path,
+            project_id=project_id,
+            team_id=team_id,
+            annotation_status_code=annotation_status,
+            folder_id=folder_id,
+            annotator_id=annotator_id,
+            annotator_name=annotator_name,
             is_pinned=data.get("is_pinned"),
         )
 
@@ -465,16 +585,29 @@ class MLModelRepository(BaseManageableRepository):
 
     @staticmethod
     def dict2entity(data: dict):
+        (
+            uuid,
+            name,
+            description,
+            base_model_id,
+            model_type,
+            task,
+            image_count,
+            path,
+            config_path,
+            is_global,
+            training_status,
+        ) = _ML_MODEL_GETTER(data)
         return MLModelEntity(
-            uuid=data["id"],
-            name=data["name"],
-            description=data["description"],
-            base_model_id=data["base_model_id"],
-            model_type=data["type"],
-            task=data["task"],
-            image_count=data["image_count"],
-            path=data["path"],
-            config_path=data["config_path"],
-            is_global=data["is_global"],
-            training_status=data["training_status"],
+            uuid=uuid,
+            name=name,
+            description=description,
+            base_model_id=base_model_id,
+            model_type=model_type,
+            task=task,
+            image_count=image_count,
+            path=path,
+            config_path=config_path,
+            is_global=is_global,
+            training_status=training_status,
         )
@@ -19,6 +19,11 @@ from lib.core.serviceproviders import SuerannotateServiceProvider
 from lib.infrastructure.helpers import timed_lru_cache
 from requests.exceptions import HTTPError
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 requests.packages.urllib3.disable_warnings()
 
 
@@ -128,7 +133,7 @@ class BaseBackendService(SuerannotateServiceProvider):
         if response.status_code != 200:
             return {"data": []}, 0
             # raise AppException(f"Got invalid response for url {url}: {response.text}.")
-        data = response.json()
+        data = json_loads(response.content)
         if data:
             if isinstance(data, dict):
                 if key_field:
@@ -456,8 +461,7 @@ class SuperannotateBackendService(BaseBackendService):
         url = urljoin(self.api_url, self.URL_FOLDERS_IMAGES)
         if query_string:
             url = f"{url}?{query_string}"
-        pages = self._get_all_pages(url, key_field="images")
-        return [image for image in pages]
+        return self._get_all_pages(url, key_field="images")
 
     def list_images(self, query_string):
         url = urljoin(self.api_url, self.URL_GET_IMAGES)
@@ -0,0 +1,30 @@
+import os
+from os.path import dirname
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.superannotate.lib.app.analytics import common
+
+
+class TestAggregateAnnotations(TestCase):
+    TEST_VECTOR_FOLDER_PATH = "data_set/sample_project_vector"
+
+    @property
+    def vector_folder_path(self):
+        return os.path.join(dirname(dirname(__file__)), self.TEST_VECTOR_FOLDER_PATH)
+
+    def test_process_pool_is_opt_in(self):
+        self.assertIsNone(common.PARALLEL_AGGREGATION_FILES_COUNT)
+        with patch.object(common.concurrent.futures, "ProcessPoolExecutor") as pool:
+            common.aggregate_image_annotations_as_df(self.vector_folder_path)
+        pool.assert_not_called()
+
+    def test_process_pool_rows_match_sequential(self):
+        df = common.aggregate_image_annotations_as_df(self.vector_folder_path)
+        with patch.object(common, "PARALLEL_AGGREGATION_FILES_COUNT", 1), patch.object(
+            common.os, "cpu_count", return_value=2
+        ):
+            pool_df = common.aggregate_image_annotations_as_df(self.vector_folder_path)
+        self.assertEqual(
+            pool_df.astype(str).to_dict("records"), df.astype(str).to_dict("records")
+        )
@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+from os.path import dirname
+from pathlib import Path
+from unittest import TestCase
+
+import src.superannotate as sa
+
+from src.superannotate.lib.app.analytics.common import (
+    aggregate_image_annotations_as_df,
+)
+from src.superannotate.lib.app.analytics.common import df_to_annotations
+
+
+class TestDfToAnnotations(TestCase):
+    TEST_VECTOR_FOLDER_PATH = "data_set/sample_project_vector"
+
+    @property
+    def vector_folder_path(self):
+        return os.path.join(dirname(dirname(__file__)), self.TEST_VECTOR_FOLDER_PATH)
+
+    def test_round_trip_with_default_flags(self):
+        df = aggregate_image_annotations_as_df(self.vector_folder_path)
+        self.assertNotIn("tag", df.columns)
+        with tempfile.TemporaryDirectory() as tmpdir_name:
+            df_to_annotations(df, Path(tmpdir_name))
+            self.assertEqual(
+                sorted(path.name for path in Path(tmpdir_name).glob("*.json")),
+                sorted(
+                    path.name for path in Path(self.vector_folder_path).glob("*.json")
+                ),
+            )
+            self.assertTrue(
+                (Path(tmpdir_name) / "classes" / "classes.json").is_file()
+            )
+            round_trip_df = aggregate_image_annotations_as_df(tmpdir_name)
+        self.assertEqual(len(round_trip_df), len(df))
+        self.assertEqual(
+            sorted(round_trip_df["instanceId"].dropna().unique()),
+            sorted(df["instanceId"].dropna().unique()),
+        )
+
+    def test_public_df_to_annotations(self):
+        df = aggregate_image_annotations_as_df(self.vector_folder_path)
+        with tempfile.TemporaryDirectory() as tmpdir_name:
+            # the undecorated function, Trackable needs team credentials
+            sa.df_to_annotations.function(df, tmpdir_name)
+            for path in Path(self.vector_folder_path).glob("*.json"):
+                with open(Path(tmpdir_name) / path.name) as annotation_file:
+                    annotation = json.load(annotation_file)
+                self.assertEqual(annotation["tags"], [])
+                self.assertTrue(annotation["instances"])
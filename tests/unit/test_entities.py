@@ -0,0 +1,37 @@
+import pickle
+from unittest import TestCase
+
+from src.superannotate.lib.core.entities import ImageEntity
+
+
+class TestImageEntity(TestCase):
+    RECORDS = [
+        {
+            "id": 1,
+            "name": "example.jpg",
+            "path": "path",
+            "project_id": 2,
+            "team_id": 3,
+            "annotation_status": 4,
+            "folder_id": 5,
+            "is_pinned": 0,
+            "createdAt": "2021-01-01T00:00:00.000Z",
+        },
+        {"uuid": 6, "annotation_status_code": 2},
+        {},
+    ]
+
+    def test_bulk_from_records(self):
+        entities = ImageEntity.bulk_from_records(self.RECORDS)
+        self.assertEqual(
+            [entity.to_dict() for entity in entities],
+            [ImageEntity.from_dict(**record).to_dict() for record in self.RECORDS],
+        )
+        self.assertIsNot(entities[1].meta, entities[2].meta)
+
+    def test_pickle(self):
+        entities = ImageEntity.bulk_from_records(self.RECORDS)
+        self.assertEqual(
+            [entity.to_dict() for entity in pickle.loads(pickle.dumps(entities))],
+            [entity.to_dict() for entity in entities],
+        )
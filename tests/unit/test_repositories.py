@@ -1,12 +1,11 @@
 import configparser
 import json
+import os
+import tempfile
 from unittest import TestCase
-from unittest.mock import Mock
-from unittest.mock import mock_open
 from unittest.mock import patch
 
 import pytest
-from src.superannotate.lib.core import CONFIG_FILE_LOCATION
 from src.superannotate.lib.core.entities import ConfigEntity
 from src.superannotate.lib.infrastructure.repositories import ConfigRepository
 
@@ -46,37 +45,37 @@ class TestConfigRepository(TestCase):
         get_config.assert_called()
         self.assertEquals(len(entities), 2)
 
-    @patch(
-        "src.superannotate.lib.infrastructure.repositories.ConfigRepository._get_config"
-    )
-    @patch("builtins.open", new_callable=mock_open)
-    def test_insert(self, mock_file, get_config):
-        config_mock = Mock()
-        get_config.return_value = config_mock
-        entity = self.repo.insert(self.config_entity)
-        get_config.assert_called()
-        config_mock.set.assert_called_with(
-            "default", self.config_entity.uuid, self.config_entity.value
-        )
-        mock_file.assert_called_with(CONFIG_FILE_LOCATION, "rw+")
-        self.assertIsInstance(entity, ConfigEntity)
 
-    @patch(
-        "src.superannotate.lib.infrastructure.repositories.ConfigRepository._get_config"
-    )
-    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(FILE_CONTENT))
-    def test_update(self, mock_file, get_config):
-        self.repo.update(self.config_entity)
-        get_config.assert_called()
-        mock_file.assert_called_with(CONFIG_FILE_LOCATION, "rw+")
+class TestConfigRepositoryCache(TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self._temp_dir.name, "config.json")
+        with open(self.config_path, "w") as config_file:
+            json.dump({"token": "value"}, config_file)
+        self.repo = ConfigRepository(self.config_path)
 
-    @patch(
-        "src.superannotate.lib.infrastructure.repositories.ConfigRepository._get_config"
-    )
-    @patch("builtins.open", new_callable=mock_open, read_data=json.dumps(FILE_CONTENT))
-    def test_delete(self, mock_file, get_config):
-        config_mock = Mock()
-        get_config.return_value = config_mock
-        self.repo.delete(self.TEST_UUID)
-        config_mock.remove_option.assert_called_with("default", self.TEST_UUID)
-        mock_file.assert_called_with(CONFIG_FILE_LOCATION, "rw+")
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def test_get_one_reads_file_once(self):
+        with patch("builtins.open", wraps=open) as open_mock:
+            self.assertEqual(self.repo.get_one("token").value, "value")
+            self.assertEqual(self.repo.get_one("token").value, "value")
+            self.assertEqual(open_mock.call_count, 1)
+
+    def test_insert_invalidates_cache(self):
+        self.assertEqual(self.repo.get_one("token").value, "value")
+        self.repo.insert(ConfigEntity(uuid="token", value="new_value"))
+        self.assertEqual(self.repo.get_one("token").value, "new_value")
+
+    def test_delete(self):
+        self.repo.insert(ConfigEntity(uuid="main_endpoint", value="url"))
+        self.repo.delete("token")
+        self.assertEqual(self.repo.get_one("token").value, None)
+        with open(self.config_path) as config_file:
+            self.assertEqual(json.load(config_file), {"main_endpoint": "url"})
+
+    def test_update(self):
+        self.repo.update(ConfigEntity(uuid="token", value="new_value"))
+        with open(self.config_path) as config_file:
+            self.assertEqual(json.load(config_file), {"token": "new_value"})
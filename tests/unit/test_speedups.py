@@ -0,0 +1,89 @@
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import skipUnless
+from unittest import TestCase
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+from PIL import Image
+from src.superannotate.lib.app.analytics import common
+from src.superannotate.lib.core import plugin
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class TestLoadJson(TestCase):
+    DATA = {"instances": [{"className": "car", "points": {"x1": 1.5}}], "id": 1}
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self._temp_dir.name) / "annotation.json"
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _load(self, text):
+        self.path.write_text(text)
+        return common.load_json(self.path)
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_orjson(self):
+        self.assertIs(common.json_loads, orjson.loads)
+        self.assertEqual(self._load(json.dumps(self.DATA)), self.DATA)
+
+    def test_json_fallback(self):
+        with patch.object(common, "json_loads", json.loads):
+            self.assertEqual(self._load(json.dumps(self.DATA)), self.DATA)
+
+    def test_values_orjson_rejects(self):
+        data = self._load('{"value": NaN, "id": 123456789012345678901234567890}')
+        self.assertTrue(np.isnan(data["value"]))
+        self.assertEqual(data["id"], 123456789012345678901234567890)
+
+
+class TestTurboJpeg(TestCase):
+    def setUp(self) -> None:
+        y, x = np.mgrid[0:96, 0:128]
+        array = np.dstack((x * 2, y * 2, x + y)).astype(np.uint8)
+        self.image_bytes = io.BytesIO()
+        Image.fromarray(array).save(self.image_bytes, "JPEG")
+        self.frame = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
+
+    def _decode(self):
+        image = plugin.ImagePlugin(self.image_bytes.getvalue(), 10 ** 8)
+        return np.asarray(image.content).astype(int)
+
+    def _write_frame(self):
+        with tempfile.TemporaryDirectory() as tmpdir_name:
+            path = os.path.join(tmpdir_name, "frame.jpg")
+            plugin.VideoPlugin.write_frame(path, self.frame)
+            return np.asarray(Image.open(path).convert("RGB")).astype(int)
+
+    @skipUnless(plugin._turbo_jpeg, "PyTurboJPEG or libjpeg-turbo is not installed")
+    def test_turbo_jpeg(self):
+        decoded = self._decode()
+        with patch.object(plugin, "_turbo_jpeg", None):
+            fallback = self._decode()
+        self.assertEqual(decoded.shape, (96, 128, 4))
+        self.assertLessEqual(abs(decoded - fallback).max(), 2)
+        written = self._write_frame()
+        with patch.object(plugin, "_turbo_jpeg", None):
+            fallback = self._write_frame()
+        self.assertLessEqual(abs(written - fallback).mean(), 2)
+
+    def test_pillow_and_opencv_fallback(self):
+        with patch.object(plugin, "_turbo_jpeg", None):
+            decoded = self._decode()
+            written = self._write_frame()
+        self.assertEqual(decoded.shape, (96, 128, 4))
+        self.assertEqual(written.shape, (96, 128, 3))
+        self.assertLess(
+            abs(written - cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB)).mean(), 2
+        )
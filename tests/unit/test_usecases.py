@@ -1,10 +1,15 @@
+import pickle
 from unittest import TestCase
 from unittest.mock import Mock
 
 import pytest
 
+from src.superannotate.lib.core import DEFAULT_HYPER_PARAMETERS
+from src.superannotate.lib.core.entities import FolderEntity
+from src.superannotate.lib.core.entities import ProjectEntity
 from src.superannotate.lib.core.exceptions import AppValidationException
 from src.superannotate.lib.core.usecases import BaseUseCase
+from src.superannotate.lib.core.usecases import CreateModelUseCase
 
 
 @pytest.mark.skip(reason="Need to adjust")
@@ -32,3 +37,79 @@ class TestBaseUseCase(TestCase):
     def test_validate_should_fill_errors(self):
         print(self.use_case.execute().errors)
         assert len(self.use_case.execute().errors) == 2
+
+
+class TestCreateModelUseCase(TestCase):
+    @staticmethod
+    def _query(condition):
+        return dict(part.split("=") for part in condition.build_query().split("&"))
+
+    def setUp(self):
+        projects = {
+            name: ProjectEntity(uuid=uuid, name=name, project_type=1, upload_state=1)
+            for uuid, name in ((1, "train"), (2, "test"))
+        }
+        self.projects_repo = Mock()
+        self.projects_repo.get_all.side_effect = lambda condition: [
+            projects[self._query(condition)["name"]]
+        ]
+        self.folders_repo = Mock()
+        self.folders_repo.get_all.side_effect = lambda condition: [
+            FolderEntity(uuid=f"{query['project_id']}/{name}", name=name)
+            for query in [self._query(condition)]
+            for name in ([query["name"]] if "name" in query else ["a", "b"])
+        ]
+        self.ml_models = Mock()
+        self.ml_models.get_all.return_value = [Mock(model_type=1, uuid=3)]
+        self.backend = Mock()
+        self.backend.bulk_get_folders.return_value = {"data": []}
+
+    def _execute(self, train_data_paths, test_data_paths, hyper_parameters=None):
+        use_case = CreateModelUseCase(
+            base_model_name="base",
+            model_name="model",
+            model_description="",
+            task="Object Detection for Vector Projects",
+            team_id=1,
+            train_data_paths=train_data_paths,
+            test_data_paths=test_data_paths,
+            backend_service_provider=self.backend,
+            projects=self.projects_repo,
+            folders=self.folders_repo,
+            ml_models=self.ml_models,
+            hyper_parameters=hyper_parameters,
+        )
+        use_case.execute()
+        return use_case._response
+
+    def test_folders_are_looked_up_in_their_projects(self):
+        self._execute(["train/a", "train/b"], ["test/a"])
+        self.assertEqual(self.projects_repo.get_all.call_count, 2)
+        self.assertEqual(self.folders_repo.get_all.call_count, 2)
+        ml_model = self.ml_models.insert.call_args[0][0]
+        self.assertEqual(ml_model.train_folder_ids, ["1/a", "1/b"])
+        self.assertEqual(ml_model.test_folder_ids, ["2/a"])
+        self.backend.bulk_get_folders.assert_called_once_with(1, [1, 2])
+
+    def test_overlapping_paths_fail_before_lookups(self):
+        response = self._execute(["train/a", "train/b"], ["train/b"])
+        self.assertIn("overlapping", str(response.errors))
+        self.projects_repo.get_all.assert_not_called()
+        self.folders_repo.get_all.assert_not_called()
+
+    def test_hyper_parameters_are_merged_into_a_new_dict(self):
+        hyper_parameters = {"num_epochs": 3}
+        self._execute(["train/a"], ["test/a"], hyper_parameters)
+        ml_model = self.ml_models.insert.call_args[0][0]
+        self.assertEqual(hyper_parameters, {"num_epochs": 3})
+        self.assertEqual(ml_model.hyper_parameters["num_epochs"], 3)
+        self.assertEqual(
+            ml_model.hyper_parameters["steps"], DEFAULT_HYPER_PARAMETERS["steps"]
+        )
+        self.assertIsNot(
+            ml_model.hyper_parameters["steps"], DEFAULT_HYPER_PARAMETERS["steps"]
+        )
+        self.assertEqual(
+            pickle.loads(pickle.dumps(ml_model)).hyper_parameters,
+            ml_model.hyper_parameters,
+        )